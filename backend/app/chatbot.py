@@ -5,7 +5,14 @@ Specialized chatbot for marine biology and oceanography queries
 
 import openai
 import asyncio
-from typing import List, Dict, Optional
+import httpx
+import hashlib
+import re
+import time
+import numpy as np
+from collections import OrderedDict, defaultdict, deque
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 import json
 import os
 from datetime import datetime
@@ -15,6 +22,9 @@ from dotenv import load_dotenv
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend', '.env')
 load_dotenv(env_path)
 
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+
 # Optional Claude integration
 try:
     import anthropic
@@ -22,54 +32,505 @@ try:
 except ImportError:
     CLAUDE_AVAILABLE = False
 
+# Optional Redis integration for shared conversation history
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Optional FAISS integration for semantic cache similarity search
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Optional orjson for (de)serializing Redis-backed history
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional tiktoken integration for token-accurate context budgeting
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Marine research specialized system prompt
+SYSTEM_PROMPT = """
+You are Matsya AI, an expert marine biology and oceanography assistant for the Matsya Ocean Insights platform. 
+
+Your expertise includes:
+- Marine biodiversity and taxonomy
+- Fish species identification and classification
+- Environmental DNA (eDNA) analysis
+- Oceanographic data interpretation
+- Marine conservation strategies
+- Fisheries science and management
+- Marine ecosystem dynamics
+- Climate change impacts on marine life
+- Taxonomic validation using Darwin Core standards
+- Research methodology and data analysis
+
+Always provide:
+- Scientifically accurate information
+- Relevant data sources and citations when possible
+- Practical applications for marine research
+- Suggestions for further analysis using platform tools
+
+Be conversational but professional, and relate responses to the user's marine research goals.
+"""
+
+# Shared system message for OpenAI requests, and the Anthropic system block
+# marked for prompt caching (the stable prefix of every Claude request)
+SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+CLAUDE_SYSTEM_BLOCK = {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+
+# Semantic response cache settings
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_CONTEXT_TURNS = 2
+# Contexts holding this many responses are searched through a FAISS HNSW
+# index; smaller ones (nearly all, as the context changes every turn) are
+# scored with a single matrix product
+SEMANTIC_CACHE_HNSW_MIN_ENTRIES = 1024
+SEMANTIC_CACHE_HNSW_M = 32
+SEMANTIC_CACHE_HNSW_EF_SEARCH = 64
+# Optional .npz with "mean" and "components" from a PCA fitted offline on
+# collected embeddings (see fit_embedding_projection); reduces 1536-d to ~128-d
+SEMANTIC_CACHE_PCA_PATH = os.getenv("SEMANTIC_CACHE_PCA_PATH")
+SEMANTIC_CACHE_PCA_COMPONENTS = 128
+EMBEDDING_CACHE_SIZE = 2048
+# Semantic cache bounds: total cached responses (trimmed from the least
+# recently used contexts first), responses kept per context (oldest dropped
+# first; every first turn shares one context) and seconds each response lives
+SEMANTIC_CACHE_SIZE = 10000
+SEMANTIC_CACHE_PARTITION_SIZE = 2048
+SEMANTIC_CACHE_TTL = 3600
+
+# Exact-match response cache keyed on the full OpenAI request
+EXACT_CACHE_SIZE = 10000
+
+# Conversation history bound (10 user + 10 assistant messages)
+MAX_HISTORY_MESSAGES = 20
+
+# Redis conversation keys expire after an hour of inactivity
+CONVERSATION_TTL_SECONDS = 3600
+
+# Token budget for the history sent with each request
+CONTEXT_TOKEN_BUDGET = 4000
+
+# Streaming: flush coalesced deltas at this many characters or seconds
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.025
+
+# Rolling summary of older turns once the history buffer fills up
+SUMMARY_MODEL = "gpt-3.5-turbo"
+SUMMARY_KEEP_RECENT = 6
+SUMMARY_PROMPT = (
+    "Summarize the conversation so far in <=200 tokens. Keep the species, "
+    "locations, datasets and research goals the user mentioned."
+)
+
+# Keyword-based topic extraction for conversation summaries
+MARINE_TOPIC_KEYWORDS = {
+    "species identification": ["species", "identify", "classification", "taxonomy"],
+    "eDNA analysis": ["edna", "dna", "genetic", "sequence"],
+    "oceanography": ["ocean", "temperature", "salinity", "current"],
+    "conservation": ["conservation", "endangered", "protection", "sustainability"],
+    "fisheries": ["fishing", "fisheries", "catch", "stock"],
+    "biodiversity": ["biodiversity", "diversity", "ecosystem", "habitat"]
+}
+_KEYWORD_TO_TOPIC = {
+    keyword: topic
+    for topic, keywords in MARINE_TOPIC_KEYWORDS.items()
+    for keyword in keywords
+}
+# Follow-up suggestions keyed by the terms that trigger them (in priority order)
+SUGGESTION_GROUPS = {
+    "species": ["Upload an image for species classification", "Explore species occurrence data"],
+    "dna": ["Upload eDNA sequence files for analysis", "View biodiversity assessment tools"],
+    "location": ["Explore the 3D marine map", "View geographic distribution data"],
+    "research": ["Access research publishing tools", "Create a new research project"],
+    "data": ["Upload taxonomy dataset", "Sync with OBIS database"]
+}
+_SUGGESTION_TERMS = {
+    "species": ["species", "identify", "classification"],
+    "dna": ["dna", "edna", "genetic"],
+    "location": ["location", "geographic", "distribution"],
+    "research": ["research", "study", "analysis"],
+    "data": ["data", "dataset", "database"]
+}
+_SUGGESTION_RE = re.compile("|".join(
+    f"(?P<{group}>" + "|".join(map(re.escape, sorted(terms, key=len, reverse=True))) + ")"
+    for group, terms in _SUGGESTION_TERMS.items()
+), re.IGNORECASE)
+
+_TOPIC_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(_KEYWORD_TO_TOPIC, key=len, reverse=True))) + r")\b",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """Load the GPT-4 tokenizer once, or None when tiktoken is unusable"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-4")
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Count tokens in a message; cached so each turn is only encoded once"""
+    encoding = _token_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1  # Rough estimate without tiktoken
+    return len(encoding.encode(text))
+
+
+def fit_embedding_projection(embeddings, path: str, n_components: int = SEMANTIC_CACHE_PCA_COMPONENTS):
+    """Fit a PCA on collected embeddings offline and save it for the semantic cache"""
+    from sklearn.decomposition import PCA
+    pca = PCA(n_components=n_components).fit(np.asarray(embeddings, dtype=np.float32))
+    np.savez(path, mean=pca.mean_.astype(np.float32), components=pca.components_.astype(np.float32))
+
+
+def load_embedding_projection(path: Optional[str]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Load a saved PCA projection as (mean, components), or None if unavailable"""
+    if not path:
+        return None
+    try:
+        with np.load(path) as data:
+            return data["mean"].astype(np.float32), data["components"].astype(np.float32)
+    except Exception as e:
+        print(f"Could not load embedding projection from {path}: {e}")
+        return None
+
+
+class _CachePartition:
+    """
+    Responses cached under one context hash, oldest first.
+
+    Live embeddings are the rows vectors[start:start + len]; evicting the
+    oldest just advances start, and the buffer is compacted or grown when it
+    fills. Row index_start is id 0 of the HNSW index, if there is one, so
+    searches are restricted to the live id range.
+    """
+
+    def __init__(self, dim: int):
+        self.vectors = np.empty((4, dim), dtype=np.float32)
+        self.start = 0
+        self.responses: deque = deque()
+        self.expiries: deque = deque()
+        self.index = None
+        self.index_start = 0
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+    def _live(self) -> np.ndarray:
+        return self.vectors[self.start:self.start + len(self.responses)]
+
+    def _build_index(self):
+        self.index = SemanticCache._new_index(self.vectors.shape[1])
+        self.index.add(self._live())
+        self.index_start = self.start
+
+    def _make_room(self):
+        live = self._live()
+        if len(live) * 2 > len(self.vectors):
+            vectors = np.empty((len(self.vectors) * 2, self.vectors.shape[1]), dtype=np.float32)
+        else:
+            vectors = self.vectors
+        vectors[:len(live)] = live
+        self.vectors, self.start = vectors, 0
+        # Row numbers changed, so the index is rebuilt without the evicted rows
+        if self.index is not None:
+            self._build_index()
+
+    def append(self, vector: np.ndarray, response: str, expires: float):
+        if self.start + len(self.responses) == len(self.vectors):
+            self._make_room()
+        self.vectors[self.start + len(self.responses)] = vector
+        self.responses.append(response)
+        self.expiries.append(expires)
+        if self.index is not None:
+            self.index.add(vector[None, :])
+        elif FAISS_AVAILABLE and len(self.responses) >= SEMANTIC_CACHE_HNSW_MIN_ENTRIES:
+            self._build_index()
+
+    def pop_oldest(self):
+        self.responses.popleft()
+        self.expiries.popleft()
+        self.start += 1
+
+    def expire(self, now: float) -> int:
+        """Drop responses past their expiry (always the oldest ones); return how many"""
+        expired = 0
+        while self.expiries and self.expiries[0] < now:
+            self.pop_oldest()
+            expired += 1
+        return expired
+
+    def best(self, query: np.ndarray) -> Tuple[int, float]:
+        """Position and score of the stored response closest to the query, or -1"""
+        if self.index is not None:
+            first = self.start - self.index_start
+            params = faiss.SearchParametersHNSW(
+                sel=faiss.IDSelectorRange(first, first + len(self.responses)),
+                efSearch=SEMANTIC_CACHE_HNSW_EF_SEARCH
+            )
+            scores, ids = self.index.search(query[None, :], 1, params=params)
+            best = int(ids[0, 0])
+            return (best - first if best >= 0 else -1), float(scores[0, 0])
+        scores = self._live() @ query
+        best = int(scores.argmax())
+        return best, float(scores[best])
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache of AI responses.
+
+    Entries are partitioned by a context hash so a cached answer is only
+    reused for a conversation in the same state. Embeddings are stored
+    unit-normalised, so cosine similarity is an inner product over the
+    partition's numpy matrix; a partition that grows past
+    SEMANTIC_CACHE_HNSW_MIN_ENTRIES moves to a FAISS HNSW index when faiss
+    is installed.
+    An optional PCA projection shrinks embeddings before they are stored.
+    Each response expires after the TTL. A context keeps at most
+    max_partition_entries responses, dropping its oldest, and past
+    max_entries in total the oldest responses of the least recently used
+    contexts go first.
+    """
+
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 projection: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                 max_entries: int = SEMANTIC_CACHE_SIZE,
+                 max_partition_entries: int = SEMANTIC_CACHE_PARTITION_SIZE,
+                 ttl: Optional[float] = SEMANTIC_CACHE_TTL):
+        self.threshold = threshold
+        self.projection = projection
+        self.max_entries = max_entries
+        self.max_partition_entries = max_partition_entries
+        self.ttl = ttl
+        # LRU over context hashes
+        self._partitions: "OrderedDict[str, _CachePartition]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def context_hash(system_prompt: str, user_turns: List[str]) -> str:
+        """Hash the system prompt and the most recent user turns"""
+        digest = hashlib.sha256(system_prompt.encode("utf-8"))
+        for turn in user_turns[-SEMANTIC_CACHE_CONTEXT_TURNS:]:
+            digest.update(b"\x00")
+            digest.update(turn.encode("utf-8"))
+        return digest.hexdigest()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _normalize(self, embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self.projection is not None:
+            mean, components = self.projection
+            vector = (vector - mean) @ components.T
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    @staticmethod
+    def _new_index(dim: int):
+        index = faiss.IndexHNSWFlat(dim, SEMANTIC_CACHE_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = SEMANTIC_CACHE_HNSW_EF_SEARCH
+        return index
+
+    def _get(self, context_hash: str) -> Optional[_CachePartition]:
+        """Return a partition without its expired responses, marking it recently used"""
+        partition = self._partitions.get(context_hash)
+        if partition is None:
+            return None
+        self._size -= partition.expire(time.monotonic())
+        if not partition:
+            del self._partitions[context_hash]
+            return None
+        self._partitions.move_to_end(context_hash)
+        return partition
+
+    def lookup(self, context_hash: str, embedding) -> Optional[str]:
+        """Return the cached response most similar to the embedding, if close enough"""
+        partition = self._get(context_hash)
+        if partition is None:
+            return None
+
+        best, score = partition.best(self._normalize(embedding))
+        if best >= 0 and score >= self.threshold:
+            return partition.responses[best]
+        return None
+
+    def add(self, context_hash: str, embedding, response: str):
+        """Store a response under its context hash, evicting the oldest responses past the size caps"""
+        vector = self._normalize(embedding)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        partition = self._get(context_hash)
+        if partition is None:
+            partition = self._partitions[context_hash] = _CachePartition(vector.shape[0])
+        elif len(partition) >= self.max_partition_entries:
+            partition.pop_oldest()
+            self._size -= 1
+        partition.append(vector, response, expires)
+        self._size += 1
+
+        while self._size > self.max_entries:
+            oldest_hash, oldest = next(iter(self._partitions.items()))
+            oldest.pop_oldest()
+            self._size -= 1
+            if not oldest:
+                del self._partitions[oldest_hash]
+
+    def clear(self):
+        self._partitions.clear()
+        self._size = 0
+
+
+class InMemoryConversationStore:
+    """Process-local conversation history, bounded per user"""
+
+    def __init__(self, max_messages: int = MAX_HISTORY_MESSAGES):
+        self.max_messages = max_messages
+        self._conversations: Dict[str, deque] = {}
+
+    async def get(self, user_id: str) -> List[Dict]:
+        return list(self._conversations.get(user_id, ()))
+
+    async def append(self, user_id: str, *messages: Dict) -> int:
+        """Append messages and return the resulting history length"""
+        history = self._conversations.get(user_id)
+        if history is None:
+            history = self._conversations[user_id] = deque(maxlen=self.max_messages)
+        history.extend(messages)
+        return len(history)
+
+    async def replace(self, user_id: str, messages: List[Dict]):
+        self._conversations[user_id] = deque(messages, maxlen=self.max_messages)
+
+    async def clear(self, user_id: str):
+        self._conversations.pop(user_id, None)
+
+
+class RedisConversationStore:
+    """
+    Conversation history in Redis lists, shared by all backend workers.
+    Lists are trimmed to the newest messages and expire when idle.
+    """
+
+    def __init__(self, url: str, max_messages: int = MAX_HISTORY_MESSAGES,
+                 ttl: int = CONVERSATION_TTL_SECONDS):
+        self.redis = redis_asyncio.Redis.from_url(url)
+        self.max_messages = max_messages
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"conv:{user_id}"
+
+    @staticmethod
+    def _dumps(message: Dict):
+        return orjson.dumps(message) if ORJSON_AVAILABLE else json.dumps(message)
+
+    async def get(self, user_id: str) -> List[Dict]:
+        items = await self.redis.lrange(self._key(user_id), -self.max_messages, -1)
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        return [loads(item) for item in items]
+
+    async def append(self, user_id: str, *messages: Dict) -> int:
+        """Append messages and return the resulting history length"""
+        key = self._key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, *map(self._dumps, messages))
+            pipe.ltrim(key, -self.max_messages, -1)
+            pipe.expire(key, self.ttl)
+            length, _, _ = await pipe.execute()
+        return min(length, self.max_messages)
+
+    async def replace(self, user_id: str, messages: List[Dict]):
+        key = self._key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if messages:
+                pipe.rpush(key, *map(self._dumps, messages))
+                pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def clear(self, user_id: str):
+        await self.redis.delete(self._key(user_id))
+
+
+def create_conversation_store():
+    """Use Redis when REDIS_URL is configured, otherwise keep history in memory"""
+    redis_url = os.getenv("REDIS_URL")
+    if REDIS_AVAILABLE and redis_url:
+        return RedisConversationStore(redis_url)
+    return InMemoryConversationStore()
+
+
 class MarineResearchChatbot:
     def __init__(self):
         # Initialize AI clients based on available API keys
         self.openai_client = None
         self.claude_client = None
+        self._http = None
         
         # Set up OpenAI if API key is available
-        if os.getenv("OPENAI_API_KEY"):
+        if OPENAI_API_KEY:
+            # Explicit pool limits so bursts of chat requests are not
+            # serialized at the connection layer; HTTP/2 multiplexes streams
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30),
+                timeout=httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0),
+                http2=True
+            )
             self.openai_client = openai.AsyncOpenAI(
-                api_key=os.getenv("OPENAI_API_KEY")
+                api_key=OPENAI_API_KEY,
+                http_client=self._http
             )
         
         # Set up Claude if API key is available and anthropic is installed
-        if CLAUDE_AVAILABLE and os.getenv("ANTHROPIC_API_KEY"):
-            self.claude_client = anthropic.Anthropic(
-                api_key=os.getenv("ANTHROPIC_API_KEY")
+        if CLAUDE_AVAILABLE and ANTHROPIC_API_KEY:
+            self.claude_client = anthropic.AsyncAnthropic(
+                api_key=ANTHROPIC_API_KEY
             )
         
         # Determine which AI service to use
         self.ai_service = self._select_ai_service()
         
-        # Marine research specialized system prompt
-        self.system_prompt = """
-        You are Matsya AI, an expert marine biology and oceanography assistant for the Matsya Ocean Insights platform. 
-        
-        Your expertise includes:
-        - Marine biodiversity and taxonomy
-        - Fish species identification and classification
-        - Environmental DNA (eDNA) analysis
-        - Oceanographic data interpretation
-        - Marine conservation strategies
-        - Fisheries science and management
-        - Marine ecosystem dynamics
-        - Climate change impacts on marine life
-        - Taxonomic validation using Darwin Core standards
-        - Research methodology and data analysis
-        
-        Always provide:
-        - Scientifically accurate information
-        - Relevant data sources and citations when possible
-        - Practical applications for marine research
-        - Suggestions for further analysis using platform tools
-        
-        Be conversational but professional, and relate responses to the user's marine research goals.
-        """
+        # Marine research specialized system prompt (shared, counted once)
+        self.system_prompt = SYSTEM_PROMPT
+        self._system_prompt_tokens = count_tokens(SYSTEM_PROMPT)
+        
+        # Conversation history storage (system prompt is kept separately so
+        # the bounded history can never evict it)
+        self.conversations = create_conversation_store()
+        
+        # Semantic response cache (requires OpenAI embeddings)
+        self.response_cache = SemanticCache(
+            projection=load_embedding_projection(SEMANTIC_CACHE_PCA_PATH)
+        )
+        self._embedding_cache: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._exact_cache: "OrderedDict[str, str]" = OrderedDict()
         
-        # Conversation history storage
-        self.conversations: Dict[str, List[Dict]] = {}
+        # Per-user locks and in-flight background summaries
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._summarizing: set = set()
+        self._background_tasks: set = set()
     
     def _select_ai_service(self) -> str:
         """Select the best available AI service"""
@@ -88,34 +549,68 @@ class MarineResearchChatbot:
         Main chat function with marine research context
         """
         try:
-            # Initialize conversation history for new users
-            if user_id not in self.conversations:
-                self.conversations[user_id] = [
-                    {"role": "system", "content": self.system_prompt}
-                ]
-            
             # Add context from platform data if provided
             enhanced_message = self._enhance_with_context(user_message, context)
+            user_entry = {"role": "user", "content": enhanced_message}
             
-            # Add user message to conversation history
-            self.conversations[user_id].append({
-                "role": "user", 
-                "content": enhanced_message
-            })
+            # Snapshot history under the lock; the LLM call runs unlocked
+            async with self._locks[user_id]:
+                history = await self.conversations.get(user_id)
+                snapshot = [*history, user_entry]
+                user_turns = [msg["content"] for msg in history if msg["role"] == "user"]
             
-            # Get AI response based on available service
+            # Identical OpenAI requests are answered from the exact-match cache
+            # before anything is embedded
+            messages = None
+            exact_key = None
             if self.ai_service == "openai":
-                response_data = await self._chat_openai(user_id)
+                messages = self._context_messages(snapshot)
+                exact_key = self._exact_cache_key(messages)
+                exact_response = self._exact_cache.get(exact_key)
+                if exact_response is not None:
+                    self._exact_cache.move_to_end(exact_key)
+                    await self._record_turn(user_id, user_entry, exact_response)
+                    return self._chat_cached(exact_response, user_id, model="gpt-4", ai_service="exact-cache")
+            
+            # Check the semantic cache before calling the AI service; the cache
+            # is best-effort, so embedding failures fall through to the model
+            cache_key = None
+            embedding = None
+            cached_response = None
+            if self.openai_client and self.ai_service != "fallback":
+                try:
+                    cache_key = SemanticCache.context_hash(self.system_prompt, user_turns)
+                    embedding = await self._embed(enhanced_message)
+                    cached_response = self.response_cache.lookup(cache_key, embedding)
+                except Exception as e:
+                    print(f"Semantic cache lookup failed: {e}")
+                    embedding = None
+            
+            # Get AI response based on available service
+            if cached_response is not None:
+                response_data = self._chat_cached(cached_response, user_id)
+            elif self.ai_service == "openai":
+                response_data = await self._chat_openai(user_id, messages)
             elif self.ai_service == "claude":
-                response_data = await self._chat_claude(user_id)
+                response_data = await self._chat_claude(user_id, snapshot)
             else:
                 response_data = self._chat_fallback(user_message)
             
-            # Add AI response to conversation history
-            self.conversations[user_id].append({
-                "role": "assistant",
-                "content": response_data["response"]
-            })
+            if cached_response is None and embedding is not None:
+                try:
+                    self.response_cache.add(cache_key, embedding, response_data["response"])
+                except Exception as e:
+                    print(f"Semantic cache update failed: {e}")
+            
+            # Semantic hits are stored too, so a repeat skips the embedding
+            if exact_key is not None:
+                self._exact_cache[exact_key] = response_data["response"]
+                if len(self._exact_cache) > EXACT_CACHE_SIZE:
+                    self._exact_cache.popitem(last=False)
+            
+            # Record the user/assistant pair together so concurrent requests
+            # from the same user cannot interleave their turns
+            await self._record_turn(user_id, user_entry, response_data["response"])
             
             return response_data
             
@@ -128,11 +623,139 @@ class MarineResearchChatbot:
                 "ai_service": "error"
             }
     
-    async def _chat_openai(self, user_id: str) -> Dict:
-        """Handle OpenAI GPT chat"""
+    async def _record_turn(self, user_id: str, user_entry: Dict, ai_message: str):
+        """Append a completed user/assistant exchange to the history"""
+        async with self._locks[user_id]:
+            length = await self.conversations.append(
+                user_id, user_entry, {"role": "assistant", "content": ai_message}
+            )
+        
+        self._maybe_summarize(user_id, length)
+    
+    def _maybe_summarize(self, user_id: str, history_length: int):
+        """Schedule a background summary once the history buffer is full"""
+        if (history_length < MAX_HISTORY_MESSAGES
+                or user_id in self._summarizing or self.ai_service == "fallback"):
+            return
+        
+        self._summarizing.add(user_id)
+        task = asyncio.create_task(self._summarize(user_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _summarize(self, user_id: str):
+        """Replace older turns with a single system summary message"""
+        try:
+            older = (await self.conversations.get(user_id))[:-SUMMARY_KEEP_RECENT]
+            transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in older)
+            summary = await self._generate_summary(transcript)
+            if not summary:
+                return
+            
+            async with self._locks[user_id]:
+                history = await self.conversations.get(user_id)
+                # History was cleared or trimmed while the summary was generated
+                if history[:len(older)] != older:
+                    return
+                await self.conversations.replace(user_id, [
+                    {"role": "system", "content": f"Summary of the earlier conversation: {summary}"},
+                    *history[len(older):]
+                ])
+        except Exception as e:
+            print(f"Conversation summary failed for {user_id}: {e}")
+        finally:
+            self._summarizing.discard(user_id)
+    
+    async def _generate_summary(self, transcript: str) -> Optional[str]:
+        """Summarize a transcript with the cheapest available model"""
+        if self.openai_client:
+            response = await self.openai_client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": transcript}
+                ],
+                max_tokens=200,
+                temperature=0.3
+            )
+            return response.choices[0].message.content
+        
+        if self.claude_client:
+            response = await self.claude_client.messages.create(
+                model="claude-3-haiku-20240307",
+                max_tokens=200,
+                system=SUMMARY_PROMPT,
+                messages=[{"role": "user", "content": transcript}]
+            )
+            return response.content[0].text
+        
+        return None
+    
+    def _pack_context(self, history, budget: int = CONTEXT_TOKEN_BUDGET) -> List[Dict]:
+        """
+        Select the most recent messages that fit in the token budget
+        (always keeps the newest message)
+        """
+        remaining = budget - self._system_prompt_tokens
+        packed = []
+        for msg in reversed(history):
+            tokens = count_tokens(msg["content"])
+            if packed and tokens > remaining:
+                break
+            packed.append(msg)
+            remaining -= tokens
+        packed.reverse()
+        return packed
+    
+    def _context_messages(self, history: List[Dict]) -> List[Dict]:
+        """System prompt followed by as much recent history as fits the budget"""
+        return [SYSTEM_MSG, *self._pack_context(history)]
+    
+    async def _embed(self, text: str) -> Tuple[float, ...]:
+        """Embed text with OpenAI for semantic cache lookups (LRU cached)"""
+        cached = self._embedding_cache.get(text)
+        if cached is not None:
+            self._embedding_cache.move_to_end(text)
+            return cached
+        
+        response = await self.openai_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=text
+        )
+        embedding = tuple(response.data[0].embedding)
+        
+        self._embedding_cache[text] = embedding
+        if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+        return embedding
+    
+    def _chat_cached(self, ai_message: str, user_id: str,
+                     model: str = EMBEDDING_MODEL, ai_service: str = "cache") -> Dict:
+        """Build a response from the semantic or exact-match cache"""
+        return {
+            "success": True,
+            "response": ai_message,
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "tokens_used": 0,
+            "model": model,
+            "ai_service": ai_service,
+            "suggestions": self._generate_suggestions(ai_message)
+        }
+    
+    @staticmethod
+    def _exact_cache_key(messages: List[Dict]) -> str:
+        """Hash the full OpenAI request for the exact-match cache"""
+        return hashlib.sha256(json.dumps(
+            {"model": "gpt-4", "messages": messages, "temperature": 0.7},
+            sort_keys=True
+        ).encode("utf-8")).hexdigest()
+    
+    async def _chat_openai(self, user_id: str, messages: List[Dict]) -> Dict:
+        """Handle OpenAI GPT chat for already packed context messages"""
         response = await self.openai_client.chat.completions.create(
             model="gpt-4",  # or "gpt-3.5-turbo" for faster/cheaper responses
-            messages=self.conversations[user_id][-10:],  # Keep last 10 messages for context
+            messages=messages,
             max_tokens=1000,
             temperature=0.7,
             stream=False
@@ -151,21 +774,34 @@ class MarineResearchChatbot:
             "suggestions": self._generate_suggestions(ai_message)
         }
     
-    async def _chat_claude(self, user_id: str) -> Dict:
-        """Handle Anthropic Claude chat"""
-        # Convert conversation to Claude format
+    def _claude_messages(self, history: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Convert conversation history to Claude's system blocks + messages format"""
         messages = []
-        for msg in self.conversations[user_id][-10:]:
-            if msg["role"] != "system":  # Claude handles system prompt differently
+        system_blocks = [CLAUDE_SYSTEM_BLOCK]
+        for msg in self._pack_context(history):
+            if msg["role"] == "system":  # Claude handles system prompt differently
+                system_blocks.append({"type": "text", "text": msg["content"]})
+            else:
                 messages.append({
                     "role": msg["role"],
                     "content": msg["content"]
                 })
         
-        response = self.claude_client.messages.create(
+        # Claude requires the first message to come from the user; the bounded
+        # history can momentarily start with an assistant reply after eviction
+        while messages and messages[0]["role"] != "user":
+            messages.pop(0)
+        
+        return system_blocks, messages
+    
+    async def _chat_claude(self, user_id: str, history: List[Dict]) -> Dict:
+        """Handle Anthropic Claude chat"""
+        system, messages = self._claude_messages(history)
+        
+        response = await self.claude_client.messages.create(
             model="claude-3-haiku-20240307",  # or "claude-3-sonnet-20240229" for better quality
             max_tokens=1000,
-            system=self.system_prompt,
+            system=system,
             messages=messages
         )
         
@@ -253,30 +889,13 @@ User Question: {message}
         """
         Generate follow-up suggestions based on AI response
         """
-        suggestions = []
-        
-        # Analyze response content and suggest relevant platform actions
-        response_lower = ai_response.lower()
-        
-        if any(term in response_lower for term in ["species", "identify", "classification"]):
-            suggestions.append("Upload an image for species classification")
-            suggestions.append("Explore species occurrence data")
+        # Single regex pass; each named group flags one suggestion category
+        matched = {match.lastgroup for match in _SUGGESTION_RE.finditer(ai_response)}
         
-        if any(term in response_lower for term in ["dna", "edna", "genetic"]):
-            suggestions.append("Upload eDNA sequence files for analysis")
-            suggestions.append("View biodiversity assessment tools")
-        
-        if any(term in response_lower for term in ["location", "geographic", "distribution"]):
-            suggestions.append("Explore the 3D marine map")
-            suggestions.append("View geographic distribution data")
-        
-        if any(term in response_lower for term in ["research", "study", "analysis"]):
-            suggestions.append("Access research publishing tools")
-            suggestions.append("Create a new research project")
-        
-        if any(term in response_lower for term in ["data", "dataset", "database"]):
-            suggestions.append("Upload taxonomy dataset")
-            suggestions.append("Sync with OBIS database")
+        suggestions = []
+        for group, group_suggestions in SUGGESTION_GROUPS.items():
+            if group in matched:
+                suggestions.extend(group_suggestions)
         
         return suggestions[:3]  # Return top 3 suggestions
     
@@ -288,46 +907,42 @@ User Question: {message}
         Streaming chat for real-time responses
         """
         try:
-            if user_id not in self.conversations:
-                self.conversations[user_id] = [
-                    {"role": "system", "content": self.system_prompt}
-                ]
-            
             enhanced_message = self._enhance_with_context(user_message, context)
-            self.conversations[user_id].append({
-                "role": "user", 
-                "content": enhanced_message
-            })
+            user_entry = {"role": "user", "content": enhanced_message}
+            
+            async with self._locks[user_id]:
+                snapshot = [*await self.conversations.get(user_id), user_entry]
             
             # Handle streaming based on available service
+            parts = []
+            suggestions = None
             if self.ai_service == "openai":
-                async for chunk in self._stream_openai(user_id):
+                async for chunk in self._stream_openai(snapshot, parts):
                     yield chunk
             elif self.ai_service == "claude":
-                # Claude doesn't support streaming in the same way, so we'll simulate it
-                async for chunk in self._stream_claude(user_id):
+                async for chunk in self._stream_claude(snapshot, parts):
                     yield chunk
             else:
-                # Fallback streaming
+                # Fallback responses are short canned text; send in one chunk
                 response = self._chat_fallback(user_message)
-                # Simulate streaming by sending the response in chunks
-                words = response["response"].split()
-                full_response = ""
-                for word in words:
-                    full_response += word + " "
-                    yield {
-                        "type": "chunk",
-                        "content": word + " ",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    await asyncio.sleep(0.1)  # Simulate typing delay
-                
+                parts.append(response["response"])
+                suggestions = response["suggestions"]
                 yield {
-                    "type": "complete",
-                    "suggestions": response["suggestions"],
+                    "type": "chunk",
+                    "content": response["response"],
                     "timestamp": datetime.now().isoformat()
                 }
             
+            full_response = "".join(parts)
+            await self._record_turn(user_id, user_entry, full_response)
+            
+            # Send final metadata
+            yield {
+                "type": "complete",
+                "suggestions": suggestions or self._generate_suggestions(full_response),
+                "timestamp": datetime.now().isoformat()
+            }
+            
         except Exception as e:
             yield {
                 "type": "error",
@@ -335,99 +950,90 @@ User Question: {message}
                 "timestamp": datetime.now().isoformat()
             }
     
-    async def _stream_openai(self, user_id: str):
+    async def _stream_openai(self, history: List[Dict], parts: List[str]):
         """Stream OpenAI response"""
         stream = await self.openai_client.chat.completions.create(
             model="gpt-4",
-            messages=self.conversations[user_id][-10:],
+            messages=self._context_messages(history),
             max_tokens=1000,
             temperature=0.7,
             stream=True
         )
         
-        full_response = ""
-        async for chunk in stream:
-            if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-                full_response += content
+        async def deltas():
+            async for chunk in stream:
+                if chunk.choices[0].delta.content is not None:
+                    yield chunk.choices[0].delta.content
+        
+        async for message in self._coalesce_deltas(deltas(), parts):
+            yield message
+    
+    async def _stream_claude(self, history: List[Dict], parts: List[str]):
+        """Stream Claude response"""
+        system, messages = self._claude_messages(history)
+        
+        async with self.claude_client.messages.stream(
+            model="claude-3-haiku-20240307",
+            max_tokens=1000,
+            system=system,
+            messages=messages
+        ) as stream:
+            async for message in self._coalesce_deltas(stream.text_stream, parts):
+                yield message
+    
+    async def _coalesce_deltas(self, deltas, parts: List[str]):
+        """
+        Yield chunk messages from streamed text deltas, coalescing small deltas
+        so each chunk carries several tokens. Every delta is also appended to
+        parts so the caller can rebuild the full response.
+        """
+        loop = asyncio.get_running_loop()
+        # One timestamp per streamed response; "complete" carries its own
+        timestamp = datetime.now().isoformat()
+        buf = ""
+        last_flush = loop.time()
+        async for content in deltas:
+            parts.append(content)
+            buf += content
+            if len(buf) >= STREAM_FLUSH_CHARS or loop.time() - last_flush > STREAM_FLUSH_INTERVAL:
                 yield {
                     "type": "chunk",
-                    "content": content,
-                    "timestamp": datetime.now().isoformat()
+                    "content": buf,
+                    "timestamp": timestamp
                 }
+                buf = ""
+                last_flush = loop.time()
         
-        # Add complete response to history
-        self.conversations[user_id].append({
-            "role": "assistant",
-            "content": full_response
-        })
-        
-        # Send final metadata
-        yield {
-            "type": "complete",
-            "suggestions": self._generate_suggestions(full_response),
-            "timestamp": datetime.now().isoformat()
-        }
-    
-    async def _stream_claude(self, user_id: str):
-        """Stream Claude response (simulated since Claude doesn't support streaming the same way)"""
-        response_data = await self._chat_claude(user_id)
-        
-        # Simulate streaming by sending response in chunks
-        words = response_data["response"].split()
-        for word in words:
+        if buf:
             yield {
-                "type": "chunk", 
-                "content": word + " ",
-                "timestamp": datetime.now().isoformat()
+                "type": "chunk",
+                "content": buf,
+                "timestamp": timestamp
             }
-            await asyncio.sleep(0.05)  # Faster than fallback
-        
-        yield {
-            "type": "complete",
-            "suggestions": response_data["suggestions"],
-            "timestamp": datetime.now().isoformat()
-        }
     
-    def clear_conversation(self, user_id: str):
+    async def clear_conversation(self, user_id: str):
         """Clear conversation history for a user"""
-        if user_id in self.conversations:
-            self.conversations[user_id] = [
-                {"role": "system", "content": self.system_prompt}
-            ]
+        await self.conversations.clear(user_id)
     
-    def get_conversation_summary(self, user_id: str) -> Dict:
+    async def get_conversation_summary(self, user_id: str) -> Dict:
         """Get conversation statistics and summary"""
-        if user_id not in self.conversations:
+        messages = await self.conversations.get(user_id)
+        if not messages:
             return {"message_count": 0, "topics": []}
         
-        messages = self.conversations[user_id]
         user_messages = [msg for msg in messages if msg["role"] == "user"]
         
         return {
             "message_count": len(user_messages),
-            "conversation_length": len(messages) - 1,  # Exclude system message
+            "conversation_length": len(messages),
             "topics": self._extract_topics(user_messages)
         }
     
     def _extract_topics(self, messages: List[Dict]) -> List[str]:
         """Extract main topics from conversation"""
-        # Simple keyword-based topic extraction
-        topics = set()
-        marine_keywords = {
-            "species identification": ["species", "identify", "classification", "taxonomy"],
-            "eDNA analysis": ["edna", "dna", "genetic", "sequence"],
-            "oceanography": ["ocean", "temperature", "salinity", "current"],
-            "conservation": ["conservation", "endangered", "protection", "sustainability"],
-            "fisheries": ["fishing", "fisheries", "catch", "stock"],
-            "biodiversity": ["biodiversity", "diversity", "ecosystem", "habitat"]
-        }
-        
-        text = " ".join([msg["content"].lower() for msg in messages])
-        
-        for topic, keywords in marine_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                topics.add(topic)
+        # Single regex pass over the text instead of one scan per keyword
+        text = " ".join(msg["content"] for msg in messages)
+        topics = {_KEYWORD_TO_TOPIC[match.group(1).lower()] for match in _TOPIC_RE.finditer(text)}
         
         return list(topics)
 
@@ -1,204 +1,623 @@
-from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, Form, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 import asyncio
+import hashlib
+import io
 import json
+import multiprocessing
 import os
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Optional
 from dotenv import load_dotenv
+from pydantic import TypeAdapter
 from . import services, schemas
 from .chatbot import marine_chatbot
 
+# Optional fast JSON serialization for WebSocket frames
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional SIMD BLAKE3 for upload fingerprints (falls back to hashlib.blake2b)
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# orjson-backed responses when available (ORJSONResponse requires orjson)
+DefaultResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
 # Load environment variables from .env file
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backend', '.env')
 load_dotenv(env_path)
 
-app = FastAPI(title="Matsya Ocean Insights - Backend")
 
-# Allow local frontend dev server
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the parse workers and start the broadcast pump and classify batcher on
+    startup; stop them, release both pools and close the outbound HTTP client
+    on shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    # Spawning a worker and importing the parsers takes a while, so pay for it
+    # here instead of on the first uploads
+    await asyncio.gather(*(
+        loop.run_in_executor(CPU_POOL, services.warm_up) for _ in range(PARSE_WORKERS)
+    ))
+    manager.start()
+    services.classification_batcher.start()
+    try:
+        yield
+    finally:
+        services.classification_batcher.stop()
+        manager.stop()
+        PARSE_POOL.shutdown(wait=False, cancel_futures=True)
+        CPU_POOL.shutdown(wait=False, cancel_futures=True)
+        await services.close_http_client()
+
+
+app = FastAPI(
+    title="Matsya Ocean Insights - Backend",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan,
+)
+
+# Allow local frontend dev servers (override with a JSON list in CORS_ORIGINS).
+# Explicit origins, verbs and headers let browsers cache preflights for max_age.
+DEFAULT_CORS_ORIGINS = (
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "http://localhost:8080",
+    "http://127.0.0.1:8080",
+)
+CORS_ORIGINS = tuple(json.loads(os.getenv("CORS_ORIGINS") or "null") or DEFAULT_CORS_ORIGINS)
+
+# Seconds a single client may take to accept a broadcast before it is dropped
+BROADCAST_SEND_TIMEOUT = 2.0
+# Connection cap for /ws/updates, and queued broadcasts per client before the
+# oldest are dropped
+MAX_WS_CONNECTIONS = int(os.getenv("MAX_WS_CONNECTIONS", "2048"))
+WS_OUTBOX_SIZE = 64
+# Broadcasts waiting for the pump before new ones are dropped
+BROADCAST_QUEUE_SIZE = 1024
+# Close code sent to clients turned away at the connection cap ("try again later")
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+# Echo replies are built from this envelope rather than a dict per ping
+WS_ECHO_PREFIX = '{"type":"echo","message":'
+
+# Uploads are read in fixed-size chunks so oversized files are rejected early
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_CLASSIFY_UPLOAD = 10 * 1024 * 1024  # 10MB
+MAX_EDNA_UPLOAD = 100 * 1024 * 1024  # 100MB
+MAX_TAXONOMY_UPLOAD = 500 * 1024 * 1024  # 500MB
+# Accepted upload extensions (error messages list them in this order)
+EDNA_EXTENSIONS = frozenset({'fasta', 'fa', 'fastq', 'fq', 'txt'})
+EDNA_EXTENSIONS_ERROR = "Invalid file type. Allowed: fasta, fa, fastq, fq, txt"
+TAXONOMY_EXTENSIONS = frozenset({'csv', 'tsv', 'txt', 'xlsx', 'dwc', 'xml', 'json'})
+TAXONOMY_EXTENSIONS_ERROR = "Invalid file type for taxonomy. Allowed: csv, tsv, txt, xlsx, dwc, xml, json"
+# Spooled uploads stay in memory up to this size, then move to a temp file
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+# Slack for multipart boundaries and form fields when comparing Content-Length
+# against a file size limit
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+# Upload routes whose declared Content-Length is checked before the body is read
+UPLOAD_LIMITS = {
+    "/api/classify": (MAX_CLASSIFY_UPLOAD, "File size exceeds 10MB limit"),
+    "/api/edna-samples": (MAX_EDNA_UPLOAD, "File size exceeds 100MB limit"),
+    "/api/taxonomy/upload": (MAX_TAXONOMY_UPLOAD, "File size exceeds 500MB limit"),
+    "/api/taxonomy/validate": (MAX_TAXONOMY_UPLOAD, "File size exceeds 500MB limit"),
+}
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject uploads whose Content-Length already exceeds the route's limit with
+    413, before FastAPI parses the multipart body. Chunked or under-declared
+    bodies are still caught by the per-chunk checks while spooling, which
+    raise the same 413 HTTPException so clients see one error shape.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limit = UPLOAD_LIMITS.get(scope["path"])
+            if limit is not None:
+                max_size, message = limit
+                declared = dict(scope["headers"]).get(b"content-length", b"0")
+                if declared.isdigit() and int(declared) > max_size + UPLOAD_FORM_OVERHEAD:
+                    response = DefaultResponse(status_code=413, content={"detail": message})
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+# Registered before CORS so rejected uploads still carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000", "*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=("GET", "POST", "DELETE"),
+    allow_headers=("Content-Type", "Authorization"),
+    max_age=86400,
 )
 
+# Blocking file parsing runs on a bounded worker pool, off the event loop;
+# the semaphore caps queued jobs so a burst of uploads cannot pile up
+PARSE_WORKERS = os.cpu_count() or 4
+PARSE_POOL = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+PARSE_SLOTS = asyncio.Semaphore(PARSE_WORKERS * 2)
+# CPU-bound sequence analysis runs in worker processes to get past the GIL.
+# Workers are spawned rather than forked so they never inherit the event
+# loop's threads; they start on first use and take the same job slots.
+CPU_POOL = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+# Recent upload analyses keyed by content digest (plus whatever else selects
+# the parser), so re-sent files are not parsed again; entries expire after
+# ANALYSIS_CACHE_TTL seconds
+ANALYSIS_CACHE_SIZE = 256
+ANALYSIS_CACHE_TTL = 3600
+EDNA_CACHE: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+EDNA_SEQUENCE_CACHE: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+TAXONOMY_CACHE: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+
+# Serializer for /api/species (no per-request validation of service output)
+SPECIES_LIST_ADAPTER = TypeAdapter(list[schemas.SpeciesOccurrence])
+
+# Background processing tickets, polled via /api/tasks/{task_id}
+MAX_TASKS = 1000
+TASKS: "OrderedDict[str, dict]" = OrderedDict()
+_background_tasks: set = set()
+
+
 # Simple in-memory WebSocket manager
 class ConnectionManager:
+    """
+    Tracks /ws/updates clients. Broadcasts go onto one bounded queue that a
+    single pump task (started in lifespan) fans out to per-client outboxes,
+    each drained by its own writer task, so a slow client only ever loses its
+    own oldest messages.
+    """
+
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: dict[WebSocket, asyncio.Queue] = {}
+        self._writers: dict[WebSocket, asyncio.Task] = {}
+        self._pending: Optional[asyncio.Queue] = None
+        self._pump: Optional[asyncio.Task] = None
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket) -> bool:
+        """Accept a client, or close it with 1013 when the server is saturated."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        if len(self.active_connections) >= MAX_WS_CONNECTIONS:
+            await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER)
+            return False
+        outbox = asyncio.Queue(maxsize=WS_OUTBOX_SIZE)
+        self.active_connections[websocket] = outbox
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, outbox))
+        return True
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+            # Hold the writer until its cancellation has run
+            _background_tasks.add(writer)
+            writer.add_done_callback(_background_tasks.discard)
 
     async def broadcast(self, message: dict):
-        to_remove = []
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_json(message)
-            except Exception:
-                to_remove.append(connection)
-        for c in to_remove:
-            self.disconnect(c)
+        self.broadcast_nowait(message)
+
+    def broadcast_nowait(self, message: dict):
+        """
+        Queue a message for the pump without awaiting anything, so request
+        handlers can notify listeners without spawning a task per event.
+        Messages are dropped when nobody is listening or the queue is full.
+        """
+        if not self.active_connections or self._pending is None:
+            return
+        try:
+            self._pending.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+    def start(self):
+        """Create the broadcast queue and its pump on the running event loop."""
+        self._pending = asyncio.Queue(maxsize=BROADCAST_QUEUE_SIZE)
+        self._pump = asyncio.create_task(self._drain())
+
+    def stop(self):
+        """Stop the pump; broadcasts are dropped until start() is called again."""
+        if self._pump is not None:
+            self._pump.cancel()
+        self._pending = self._pump = None
+
+    async def _drain(self):
+        """Serialize each queued broadcast once and fan it out to every client."""
+        while True:
+            message = await self._pending.get()
+            if not self.active_connections:
+                continue
+            # Full outboxes drop their oldest message rather than blocking
+            text = dumps_json(message)
+            for outbox in self.active_connections.values():
+                if outbox.full():
+                    outbox.get_nowait()
+                outbox.put_nowait(text)
+
+    async def _writer(self, websocket: WebSocket, outbox: asyncio.Queue):
+        """Drain one client's outbox, dropping the client if a send fails or stalls."""
+        try:
+            while True:
+                text = await outbox.get()
+                await asyncio.wait_for(websocket.send_text(text), timeout=BROADCAST_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.disconnect(websocket)
+
+
+def dumps_json(message) -> str:
+    """Serialize a message for a WebSocket text frame, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message).decode()
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads_json(text: str):
+    """Parse JSON form fields, using orjson when installed."""
+    return orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text)
+
+
+def _json_bytes(value) -> bytes:
+    """Encode a value the same way DefaultResponse would."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def streaming_json(data: dict) -> StreamingResponse:
+    """
+    Stream a JSON object one top-level field at a time, so large analysis
+    results are never rendered into a single response buffer.
+    """
+    async def body():
+        separator = b"{"
+        for key, value in data.items():
+            yield separator + _json_bytes(str(key)) + b":" + _json_bytes(value)
+            separator = b","
+        yield b"}" if separator == b"," else b"{}"
+    return StreamingResponse(body(), media_type="application/json")
+
+
+# Media type for newline-delimited JSON list responses
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether the client asked for list results as newline-delimited JSON."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(rows) -> StreamingResponse:
+    """
+    Stream rows as newline-delimited JSON, encoding one row at a time so
+    memory stays constant however many rows a (sync or async) source yields.
+    """
+    async def body():
+        if hasattr(rows, "__aiter__"):
+            async for row in rows:
+                yield _json_bytes(row) + b"\n"
+        else:
+            for row in rows:
+                yield _json_bytes(row) + b"\n"
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def send_json(websocket: WebSocket, message: dict):
+    """Send a JSON text frame to a single websocket."""
+    await websocket.send_text(dumps_json(message))
 
 manager = ConnectionManager()
 
+# Fixed WebSocket frames, encoded once instead of per connection
+WS_WELCOME_FRAME = dumps_json({"type": "welcome", "message": "connected to Matsya backend"})
+WS_CHAT_CONNECTED_FRAME = dumps_json({
+    "type": "connected",
+    "message": "Connected to Matsya AI, your marine research assistant!"
+})
+WS_CHAT_CLEARED_FRAME = dumps_json({"type": "cleared", "message": "Conversation history cleared"})
 
-@app.get("/api/capabilities")
-async def get_backend_capabilities():
-    """Get comprehensive overview of backend capabilities and service classes."""
-    return {
-        "backend_info": {
-            "title": "Matsya Ocean Insights - Advanced Marine Research Backend",
-            "version": "2.0.0",
-            "description": "Comprehensive marine research platform with 6 major service classes",
-            "total_methods": "30+ specialized methods",
-            "scientific_computing": True,
-            "ml_capabilities": True,
-            "real_time_processing": True
+
+def _file_extension(filename: Optional[str]) -> str:
+    """Lowercased extension of an upload's filename, without the dot."""
+    return os.path.splitext(filename or '')[1][1:].lower()
+
+
+async def _read_upload(file: UploadFile, max_size: int) -> Optional[bytes]:
+    """Read an upload chunk by chunk, returning None once it exceeds max_size."""
+    buf = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buf.extend(chunk)
+        if len(buf) > max_size:
+            return None
+    return bytes(buf)
+
+
+async def run_blocking(func, *args):
+    """Run a blocking function on the parse pool without stalling the event loop."""
+    async with PARSE_SLOTS:
+        return await asyncio.get_running_loop().run_in_executor(PARSE_POOL, func, *args)
+
+
+async def run_cpu_bound(func, *args):
+    """Run a picklable top-level function in the process pool."""
+    async with PARSE_SLOTS:
+        return await asyncio.get_running_loop().run_in_executor(CPU_POOL, func, *args)
+
+
+def _content_hasher():
+    return blake3.blake3() if BLAKE3_AVAILABLE else hashlib.blake2b()
+
+
+async def _spool_upload(file: UploadFile, max_size: int) -> Optional[tuple[tempfile.SpooledTemporaryFile, bytes]]:
+    """
+    Copy an upload into a spooled temp file, hashing it on the way. Returns
+    (spool, digest), or None once it exceeds max_size.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+    size = 0
+    hasher = _content_hasher()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            spool.close()
+            return None
+        hasher.update(chunk)
+        spool.write(chunk)
+    spool.seek(0)
+    return spool, hasher.digest()
+
+
+async def _save_upload(file: UploadFile, max_size: int) -> Optional[tuple[str, bytes]]:
+    """
+    Copy an upload into a named temp file that worker processes can open,
+    hashing it on the way. Returns (path, digest), or None once it exceeds
+    max_size. Callers unlink the file.
+    """
+    size = 0
+    hasher = _content_hasher()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".upload") as tmp:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                break
+            hasher.update(chunk)
+            tmp.write(chunk)
+    if size > max_size:
+        os.unlink(tmp.name)
+        return None
+    return tmp.name, hasher.digest()
+
+
+async def _analyze_edna_upload(path: str, filename: str, digest: bytes) -> dict:
+    """
+    Analyze a saved eDNA upload in the process pool, reusing a recent result
+    for identical content. The file is unlinked either way.
+    """
+    key = (digest, _file_extension(filename))
+    try:
+        file_analysis = _cache_lookup(EDNA_CACHE, key)
+        if file_analysis is None:
+            file_analysis = await run_cpu_bound(services.process_edna_path, path, filename)
+            _cache_store(EDNA_CACHE, key, file_analysis)
+    finally:
+        os.unlink(path)
+    return file_analysis
+
+
+def _cache_lookup(cache: OrderedDict, key: tuple) -> Optional[dict]:
+    """Return a live cached analysis, marking it recently used."""
+    cached = cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        cache.move_to_end(key)
+        return cached[1]
+    return None
+
+
+def _cache_store(cache: OrderedDict, key: tuple, analysis: dict):
+    """Cache an analysis, dropping the least recently used entries once full."""
+    cache[key] = (time.monotonic() + ANALYSIS_CACHE_TTL, analysis)
+    cache.move_to_end(key)
+    while len(cache) > ANALYSIS_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _prerendered_json(data) -> tuple[bytes, str]:
+    """Serialize constant response data once, returning the body and its ETag."""
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(data)
+    else:
+        body = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _prerendered_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve pre-serialized JSON, answering 304 when the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Static capabilities overview, serialized once at import
+BACKEND_CAPABILITIES = {
+    "backend_info": {
+        "title": "Matsya Ocean Insights - Advanced Marine Research Backend",
+        "version": "2.0.0",
+        "description": "Comprehensive marine research platform with 6 major service classes",
+        "total_methods": "30+ specialized methods",
+        "scientific_computing": True,
+        "ml_capabilities": True,
+        "real_time_processing": True
+    },
+    "service_classes": {
+        "1_darwin_core_validator": {
+            "name": "DarwinCoreValidator",
+            "description": "Advanced taxonomy validation following Darwin Core standards",
+            "capabilities": [
+                "40+ validation rules for taxonomic data",
+                "Required/optional field checking",
+                "Scientific name format validation",
+                "Coordinate and date validation",
+                "Taxonomic hierarchy verification"
+            ],
+            "endpoints": ["/api/taxonomy/validate", "/api/taxonomy/upload"]
         },
-        "service_classes": {
-            "1_darwin_core_validator": {
-                "name": "DarwinCoreValidator",
-                "description": "Advanced taxonomy validation following Darwin Core standards",
-                "capabilities": [
-                    "40+ validation rules for taxonomic data",
-                    "Required/optional field checking",
-                    "Scientific name format validation",
-                    "Coordinate and date validation",
-                    "Taxonomic hierarchy verification"
-                ],
-                "endpoints": ["/api/taxonomy/validate", "/api/taxonomy/upload"]
-            },
-            "2_phylogenetic_analyzer": {
-                "name": "PhylogeneticAnalyzer", 
-                "description": "Taxonomic tree building and biodiversity analysis",
-                "capabilities": [
-                    "Taxonomic tree construction",
-                    "Shannon diversity calculation",
-                    "Simpson diversity metrics",
-                    "Species richness analysis",
-                    "Taxonomic rank distribution"
-                ],
-                "endpoints": ["/api/taxonomy/analyze"]
-            },
-            "3_taxonomic_enricher": {
-                "name": "TaxonomicEnricher",
-                "description": "External API integration for species data enrichment", 
-                "capabilities": [
-                    "GBIF API integration",
-                    "FishBase database connectivity", 
-                    "Species data enrichment",
-                    "Conservation status lookup",
-                    "Geographic distribution analysis"
-                ],
-                "endpoints": ["/api/taxonomy/enrich"]
-            },
-            "4_otolith_analyzer": {
-                "name": "OtolithAnalyzer",
-                "description": "ML-based fish age determination from otolith images",
-                "capabilities": [
-                    "OpenCV image processing",
-                    "Growth ring detection algorithms",
-                    "Age estimation with confidence scoring",
-                    "Growth pattern analysis",
-                    "Image quality assessment"
-                ],
-                "endpoints": ["/api/otolith/analyze"],
-                "ml_features": [
-                    "HoughCircles for ring detection",
-                    "CLAHE contrast enhancement", 
-                    "Morphometric measurements",
-                    "Confidence interval calculation"
-                ]
-            },
-            "5_edna_analyzer": {
-                "name": "EDNAAnalyzer",
-                "description": "Environmental DNA sequencing and metabarcoding analysis",
-                "capabilities": [
-                    "FASTA/FASTQ sequence processing",
-                    "Quality control metrics",
-                    "Species identification algorithms",
-                    "Biodiversity assessment",
-                    "Environmental correlation analysis"
-                ],
-                "endpoints": ["/api/edna/analyze", "/api/edna-samples"],
-                "analysis_features": [
-                    "Sequence quality scoring",
-                    "GC content analysis",
-                    "Homopolymer detection",
-                    "Species database matching",
-                    "Shannon diversity calculation"
-                ]
-            },
-            "6_research_publisher": {
-                "name": "ResearchPublisher",
-                "description": "Manuscript management and peer review system",
-                "capabilities": [
-                    "Manuscript content analysis",
-                    "Readability scoring",
-                    "Citation analysis",
-                    "Peer reviewer matching",
-                    "Collaboration tracking"
-                ],
-                "endpoints": ["/api/research/manuscript", "/api/research/peer-review"],
-                "publishing_features": [
-                    "Publication readiness assessment",
-                    "Journal targeting suggestions",
-                    "Impact potential scoring",
-                    "Editorial workflow management"
-                ]
-            },
-            "7_marine_data_processor": {
-                "name": "MarineDataProcessor", 
-                "description": "Real-time marine sensor data processing and analysis",
-                "capabilities": [
-                    "Multi-parameter data processing",
-                    "Quality control assessment",
-                    "Anomaly detection algorithms",
-                    "Environmental correlation analysis",
-                    "Risk assessment and alerting"
-                ],
-                "endpoints": ["/api/marine-data/process"],
-                "real_time_features": [
-                    "Oceanographic parameter analysis",
-                    "Critical alert generation",
-                    "Ecosystem health scoring",
-                    "Temporal pattern analysis"
-                ]
-            }
+        "2_phylogenetic_analyzer": {
+            "name": "PhylogeneticAnalyzer", 
+            "description": "Taxonomic tree building and biodiversity analysis",
+            "capabilities": [
+                "Taxonomic tree construction",
+                "Shannon diversity calculation",
+                "Simpson diversity metrics",
+                "Species richness analysis",
+                "Taxonomic rank distribution"
+            ],
+            "endpoints": ["/api/taxonomy/analyze"]
+        },
+        "3_taxonomic_enricher": {
+            "name": "TaxonomicEnricher",
+            "description": "External API integration for species data enrichment", 
+            "capabilities": [
+                "GBIF API integration",
+                "FishBase database connectivity", 
+                "Species data enrichment",
+                "Conservation status lookup",
+                "Geographic distribution analysis"
+            ],
+            "endpoints": ["/api/taxonomy/enrich"]
         },
-        "technical_specifications": {
-            "programming_languages": ["Python 3.12"],
-            "frameworks": ["FastAPI", "Pydantic", "Uvicorn"],
-            "scientific_libraries": ["NumPy", "OpenCV", "Pillow"],
-            "data_formats": ["Darwin Core", "FASTA", "FASTQ", "CSV", "JSON", "Images"],
-            "api_integrations": ["GBIF", "FishBase", "OBIS"],
-            "validation_standards": ["Darwin Core Archive", "Marine biodiversity standards"],
-            "ml_algorithms": ["HoughCircles", "CLAHE", "Statistical analysis", "Pattern recognition"]
+        "4_otolith_analyzer": {
+            "name": "OtolithAnalyzer",
+            "description": "ML-based fish age determination from otolith images",
+            "capabilities": [
+                "OpenCV image processing",
+                "Growth ring detection algorithms",
+                "Age estimation with confidence scoring",
+                "Growth pattern analysis",
+                "Image quality assessment"
+            ],
+            "endpoints": ["/api/otolith/analyze"],
+            "ml_features": [
+                "HoughCircles for ring detection",
+                "CLAHE contrast enhancement", 
+                "Morphometric measurements",
+                "Confidence interval calculation"
+            ]
         },
-        "research_workflows": [
-            "Taxonomic data validation and enrichment",
-            "Fish age determination through otolith analysis", 
-            "Environmental DNA biodiversity assessment",
-            "Research manuscript preparation and peer review",
-            "Real-time marine environmental monitoring",
-            "Species occurrence data processing",
-            "Geographic distribution analysis",
-            "Conservation status assessment"
-        ],
-        "quality_assurance": {
-            "data_validation": "Comprehensive error handling and quality scoring",
-            "confidence_metrics": "All analyses include confidence/reliability scores",
-            "professional_standards": "Following marine research best practices",
-            "error_handling": "Detailed error reporting and recovery mechanisms"
+        "5_edna_analyzer": {
+            "name": "EDNAAnalyzer",
+            "description": "Environmental DNA sequencing and metabarcoding analysis",
+            "capabilities": [
+                "FASTA/FASTQ sequence processing",
+                "Quality control metrics",
+                "Species identification algorithms",
+                "Biodiversity assessment",
+                "Environmental correlation analysis"
+            ],
+            "endpoints": ["/api/edna/analyze", "/api/edna-samples"],
+            "analysis_features": [
+                "Sequence quality scoring",
+                "GC content analysis",
+                "Homopolymer detection",
+                "Species database matching",
+                "Shannon diversity calculation"
+            ]
+        },
+        "6_research_publisher": {
+            "name": "ResearchPublisher",
+            "description": "Manuscript management and peer review system",
+            "capabilities": [
+                "Manuscript content analysis",
+                "Readability scoring",
+                "Citation analysis",
+                "Peer reviewer matching",
+                "Collaboration tracking"
+            ],
+            "endpoints": ["/api/research/manuscript", "/api/research/peer-review"],
+            "publishing_features": [
+                "Publication readiness assessment",
+                "Journal targeting suggestions",
+                "Impact potential scoring",
+                "Editorial workflow management"
+            ]
+        },
+        "7_marine_data_processor": {
+            "name": "MarineDataProcessor", 
+            "description": "Real-time marine sensor data processing and analysis",
+            "capabilities": [
+                "Multi-parameter data processing",
+                "Quality control assessment",
+                "Anomaly detection algorithms",
+                "Environmental correlation analysis",
+                "Risk assessment and alerting"
+            ],
+            "endpoints": ["/api/marine-data/process"],
+            "real_time_features": [
+                "Oceanographic parameter analysis",
+                "Critical alert generation",
+                "Ecosystem health scoring",
+                "Temporal pattern analysis"
+            ]
         }
+    },
+    "technical_specifications": {
+        "programming_languages": ["Python 3.12"],
+        "frameworks": ["FastAPI", "Pydantic", "Uvicorn"],
+        "scientific_libraries": ["NumPy", "OpenCV", "Pillow"],
+        "data_formats": ["Darwin Core", "FASTA", "FASTQ", "CSV", "JSON", "Images"],
+        "api_integrations": ["GBIF", "FishBase", "OBIS"],
+        "validation_standards": ["Darwin Core Archive", "Marine biodiversity standards"],
+        "ml_algorithms": ["HoughCircles", "CLAHE", "Statistical analysis", "Pattern recognition"]
+    },
+    "research_workflows": [
+        "Taxonomic data validation and enrichment",
+        "Fish age determination through otolith analysis", 
+        "Environmental DNA biodiversity assessment",
+        "Research manuscript preparation and peer review",
+        "Real-time marine environmental monitoring",
+        "Species occurrence data processing",
+        "Geographic distribution analysis",
+        "Conservation status assessment"
+    ],
+    "quality_assurance": {
+        "data_validation": "Comprehensive error handling and quality scoring",
+        "confidence_metrics": "All analyses include confidence/reliability scores",
+        "professional_standards": "Following marine research best practices",
+        "error_handling": "Detailed error reporting and recovery mechanisms"
     }
+}
+CAPABILITIES_JSON, CAPABILITIES_ETAG = _prerendered_json(BACKEND_CAPABILITIES)
+
+
+@app.get("/api/capabilities")
+async def get_backend_capabilities(request: Request):
+    """Get comprehensive overview of backend capabilities and service classes."""
+    return _prerendered_response(request, CAPABILITIES_JSON, CAPABILITIES_ETAG)
 
 
 @app.get("/api/health")
@@ -206,11 +625,17 @@ async def health():
     return {"status": "ok"}
 
 
-@app.get("/api/species", response_model=list[schemas.SpeciesOccurrence])
+@app.get(
+    "/api/species",
+    response_model=None,
+    responses={200: {"model": list[schemas.SpeciesOccurrence]}},
+)
 async def list_species():
     """Return a short list of species occurrences (mock/memory)."""
     data = await services.get_species_list()
-    return data
+    # The service already returns validated models; serialize them in one
+    # pydantic-core pass instead of re-validating through response_model
+    return Response(SPECIES_LIST_ADAPTER.dump_json(data), media_type="application/json")
 
 
 @app.post("/api/obis/sync")
@@ -218,7 +643,7 @@ async def obis_sync():
     """Trigger an OBIS fetch/sync job (mock). Returns the number of records fetched."""
     count = await services.fetch_obis_data()
     # notify websocket clients about sync
-    asyncio.create_task(manager.broadcast({"type": "obis_sync", "count": count}))
+    manager.broadcast_nowait({"type": "obis_sync", "count": count})
     return {"synced": count}
 
 
@@ -226,18 +651,20 @@ async def obis_sync():
 async def classify(file: UploadFile = File(...)):
     """Accept an image and return a mock classification result."""
     try:
-        payload = await file.read()
+        payload = await _read_upload(file, MAX_CLASSIFY_UPLOAD)
+        if payload is None:
+            raise HTTPException(status_code=413, detail="File size exceeds 10MB limit")
         result = await services.classify_image(payload, filename=file.filename)
         # broadcast a small event
-        asyncio.create_task(manager.broadcast({"type": "classification", "result": result}))
-        return JSONResponse(content=result)
+        manager.broadcast_nowait({"type": "classification", "result": result})
+        return DefaultResponse(content=result)
+    except HTTPException:
+        raise
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return DefaultResponse(status_code=500, content={"error": str(e)})
 
 
-@app.post("/api/edna-samples")
-async def upload_edna_sample(
-    file: UploadFile = File(...),
+async def edna_sample_form(
     sample_id: str = Form(...),
     location_name: str = Form(...),
     latitude: float = Form(...),
@@ -245,106 +672,186 @@ async def upload_edna_sample(
     collection_date: str = Form(...),
     depth_meters: Optional[float] = Form(None),
     notes: Optional[str] = Form(None)
+) -> schemas.EDNASampleUploadRequest:
+    """Collect eDNA sample metadata form fields (already validated by FastAPI)."""
+    return schemas.EDNASampleUploadRequest.model_construct(
+        sample_id=sample_id, location_name=location_name, latitude=latitude,
+        longitude=longitude, collection_date=collection_date,
+        depth_meters=depth_meters, notes=notes
+    )
+
+
+async def taxonomy_upload_form(
+    dataset_name: str = Form(...),
+    data_format: str = Form(...),
+    source: str = Form(...),
+    description: Optional[str] = Form(None)
+) -> schemas.TaxonomyUploadRequest:
+    """Collect taxonomy dataset form fields (already validated by FastAPI)."""
+    return schemas.TaxonomyUploadRequest.model_construct(
+        dataset_name=dataset_name, data_format=data_format,
+        source=source, description=description
+    )
+
+
+@app.post("/api/edna-samples")
+async def upload_edna_sample(
+    file: UploadFile = File(...),
+    form: schemas.EDNASampleUploadRequest = Depends(edna_sample_form),
+    background: bool = Form(False)
 ):
-    """Upload and process eDNA sample files (FASTA/FASTQ)."""
+    """
+    Upload and process eDNA sample files (FASTA/FASTQ).
+    
+    With background=true the file is parsed after the response is sent and a
+    task ticket is returned; poll /api/tasks/{task_id} for the result.
+    """
     try:
         # Validate file type
-        allowed_extensions = ['fasta', 'fa', 'fastq', 'fq', 'txt']
-        file_extension = file.filename.lower().split('.')[-1] if file.filename else ''
+        if _file_extension(file.filename) not in EDNA_EXTENSIONS:
+            raise HTTPException(status_code=400, detail=EDNA_EXTENSIONS_ERROR)
         
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
-            )
+        # Stream to a temp file, enforcing the 100MB limit as we go
+        saved = await _save_upload(file, MAX_EDNA_UPLOAD)
+        if saved is None:
+            raise HTTPException(status_code=413, detail="File size exceeds 100MB limit")
+        path, digest = saved
         
-        # Check file size (max 100MB)
-        max_size = 100 * 1024 * 1024  # 100MB
-        content = await file.read()
+        file_size = os.path.getsize(path)
+        sample_data = {
+            "id": form.sample_id,
+            **form.model_dump(),
+            "file_name": file.filename,
+            "file_size": file_size,
+            "file_type": file.content_type,
+            "status": "uploaded"
+        }
         
-        if len(content) > max_size:
-            raise HTTPException(status_code=400, detail="File size exceeds 100MB limit")
+        # Hand the saved file to a background task and return a ticket
+        if background:
+            task_id = _create_task_ticket("edna_upload")
+            task = asyncio.create_task(
+                _process_edna_task(task_id, path, digest, file.filename or 'unknown', sample_data)
+            )
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            return DefaultResponse(status_code=202, content={
+                "task_id": task_id,
+                "status": "queued",
+                "sample_id": form.sample_id
+            })
         
-        # Process file content
-        content_str = content.decode('utf-8')
-        file_analysis = services.process_edna_file(content_str, file.filename or 'unknown')
+        # Parse the file in a worker process, which reads it from disk
+        file_analysis = await _analyze_edna_upload(path, file.filename or 'unknown', digest)
         
         # Create sample record with analysis results
         sample_data = {
-            "id": sample_id,
-            "sample_id": sample_id,
-            "location_name": location_name,
-            "latitude": latitude,
-            "longitude": longitude,
-            "collection_date": collection_date,
-            "depth_meters": depth_meters,
-            "notes": notes,
-            "file_name": file.filename,
-            "file_size": len(content),
-            "file_type": file.content_type,
-            "status": "uploaded",
+            **sample_data,
             "processing_status": "completed",
             **file_analysis  # Include sequence analysis results
         }
         
         # Broadcast upload notification
-        asyncio.create_task(manager.broadcast({
+        manager.broadcast_nowait({
             "type": "edna_upload", 
-            "sample_id": sample_id,
+            "sample_id": form.sample_id,
             "analysis": file_analysis
-        }))
+        })
         
-        return JSONResponse(content=sample_data)
+        return streaming_json(sample_data)
         
     except HTTPException:
         raise
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="File must be text-based (FASTA/FASTQ)")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload processing failed: {str(e)}")
 
 
+def _create_task_ticket(kind: str) -> str:
+    """Register a queued background task and return its id."""
+    task_id = uuid.uuid4().hex
+    TASKS[task_id] = {
+        "task_id": task_id,
+        "type": kind,
+        "status": "queued",
+        "created_at": datetime.now().isoformat()
+    }
+    # Forget the oldest tickets once the registry is full
+    while len(TASKS) > MAX_TASKS:
+        TASKS.popitem(last=False)
+    return task_id
+
+
+async def _process_edna_task(task_id: str, path: str, digest: bytes, filename: str, sample_data: dict):
+    """Parse a saved eDNA upload in the background and record the result."""
+    # The ticket may already have been evicted by newer ones; if it goes while
+    # parsing, the updates below land on the detached dict and are dropped
+    task = TASKS.get(task_id)
+    if task is None:
+        os.unlink(path)
+        return
+    task["status"] = "processing"
+    try:
+        file_analysis = await _analyze_edna_upload(path, filename, digest)
+        task.update({
+            "status": "completed",
+            "result": {**sample_data, "processing_status": "completed", **file_analysis}
+        })
+        manager.broadcast_nowait({
+            "type": "edna_upload",
+            "sample_id": sample_data["sample_id"],
+            "task_id": task_id,
+            "analysis": file_analysis
+        })
+    except Exception as e:
+        task.update({"status": "failed", "error": f"Upload processing failed: {str(e)}"})
+
+
+@app.get("/api/tasks/{task_id}")
+async def get_task_status(task_id: str):
+    """Get the status (and result, once finished) of a background processing task."""
+    task = TASKS.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return DefaultResponse(content=task)
+
+
 @app.post("/api/taxonomy/upload")
 async def upload_taxonomy_data(
     file: UploadFile = File(...),
-    dataset_name: str = Form(...),
-    data_format: str = Form(...),
-    source: str = Form(...),
-    description: Optional[str] = Form(None)
+    form: schemas.TaxonomyUploadRequest = Depends(taxonomy_upload_form)
 ):
     """Upload taxonomy database files (Darwin Core, CSV, TSV, Excel)."""
     try:
         # Validate file type for taxonomy data
-        allowed_extensions = ['csv', 'tsv', 'txt', 'xlsx', 'dwc', 'xml', 'json']
-        file_extension = file.filename.lower().split('.')[-1] if file.filename else ''
+        if _file_extension(file.filename) not in TAXONOMY_EXTENSIONS:
+            raise HTTPException(status_code=400, detail=TAXONOMY_EXTENSIONS_ERROR)
         
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid file type for taxonomy. Allowed: {', '.join(allowed_extensions)}"
-            )
+        # Stream to a spooled temp file (max 500MB for taxonomy databases)
+        saved = await _spool_upload(file, MAX_TAXONOMY_UPLOAD)
+        if saved is None:
+            raise HTTPException(status_code=413, detail="File size exceeds 500MB limit")
+        spool, digest = saved
         
-        # Check file size (max 500MB for taxonomy databases)
-        max_size = 500 * 1024 * 1024  # 500MB
-        content = await file.read()
-        
-        if len(content) > max_size:
-            raise HTTPException(status_code=400, detail="File size exceeds 500MB limit")
-        
-        # Process taxonomy file content
-        taxonomy_analysis = await services.process_taxonomy_file(
-            content, file.filename or 'unknown', data_format
-        )
+        # Process taxonomy file content as a stream, unless identical content
+        # was analysed recently in the same format
+        key = (digest, _file_extension(file.filename), form.data_format.lower())
+        with spool:
+            file_size = spool.seek(0, os.SEEK_END)
+            taxonomy_analysis = _cache_lookup(TAXONOMY_CACHE, key)
+            if taxonomy_analysis is None:
+                spool.seek(0)
+                # Parse on the worker pool; the spool stays open until it finishes
+                taxonomy_analysis = await run_blocking(
+                    services.process_taxonomy_file, spool, file.filename or 'unknown', form.data_format
+                )
+                _cache_store(TAXONOMY_CACHE, key, taxonomy_analysis)
         
         # Create taxonomy dataset record
         dataset_data = {
-            "id": f"taxonomy_{dataset_name.replace(' ', '_').lower()}",
-            "dataset_name": dataset_name,
-            "data_format": data_format,
-            "source": source,
-            "description": description,
+            "id": f"taxonomy_{form.dataset_name.replace(' ', '_').lower()}",
+            **form.model_dump(),
             "file_name": file.filename,
-            "file_size": len(content),
+            "file_size": file_size,
             "file_type": file.content_type,
             "upload_date": "2024-01-15T10:30:00Z",
             "status": "uploaded",
@@ -353,18 +860,16 @@ async def upload_taxonomy_data(
         }
         
         # Broadcast taxonomy upload notification
-        asyncio.create_task(manager.broadcast({
+        manager.broadcast_nowait({
             "type": "taxonomy_upload", 
-            "dataset_name": dataset_name,
+            "dataset_name": form.dataset_name,
             "analysis": taxonomy_analysis
-        }))
+        })
         
-        return JSONResponse(content=dataset_data)
+        return streaming_json(dataset_data)
         
     except HTTPException:
         raise
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="File must be text-based")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Taxonomy upload failed: {str(e)}")
 
@@ -373,21 +878,37 @@ async def upload_taxonomy_data(
 async def validate_taxonomy_data(file: UploadFile = File(...)):
     """Validate taxonomy data using Darwin Core standards."""
     try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
+        # Stream to a spooled temp file and validate it as decoded text lines,
+        # without holding the raw bytes and a decoded copy at once
+        saved = await _spool_upload(file, MAX_TAXONOMY_UPLOAD)
+        if saved is None:
+            raise HTTPException(status_code=413, detail="File size exceeds 500MB limit")
+        spool, digest = saved
         
-        # Use the DarwinCoreValidator class
-        validation_result = services.analyze_darwin_core(content_str)
+        key = (digest, "darwin_core_validation")
+        with spool:
+            size = spool.seek(0, os.SEEK_END)
+            validation_result = _cache_lookup(TAXONOMY_CACHE, key)
+            if validation_result is None:
+                spool.seek(0)
+                # Use the DarwinCoreValidator class, off the event loop
+                validation_result = await run_blocking(
+                    services.analyze_darwin_core,
+                    io.TextIOWrapper(spool, encoding='utf-8', newline='')
+                )
+                _cache_store(TAXONOMY_CACHE, key, validation_result)
         
-        return JSONResponse(content={
+        return DefaultResponse(content={
             "status": "success",
             "validation_result": validation_result,
             "file_info": {
                 "filename": file.filename,
-                "size": len(content),
+                "size": size,
                 "type": file.content_type
             }
         })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
 
@@ -401,12 +922,12 @@ async def analyze_otolith_image(file: UploadFile = File(...)):
         
         content = await file.read()
         
-        # Use the OtolithAnalyzer class
-        analysis_result = services.OtolithAnalyzer.analyze_otolith_image(
-            content, file.filename or 'unknown'
+        # Use the OtolithAnalyzer class (OpenCV work runs on the parse pool)
+        analysis_result = await run_blocking(
+            services.OtolithAnalyzer.analyze_otolith_image, content, file.filename or 'unknown'
         )
         
-        return JSONResponse(content={
+        return DefaultResponse(content={
             "status": "success",
             "analysis": analysis_result,
             "file_info": {
@@ -426,12 +947,20 @@ async def analyze_edna_sequences(
 ):
     """Analyze eDNA sequences for species identification and biodiversity."""
     try:
-        # Use the EDNAAnalyzer class
-        analysis_result = services.EDNAAnalyzer.analyze_edna_sequences(
-            sequences, metadata or {}
-        )
+        # The analysis is deterministic, so identical requests share a result
+        hasher = _content_hasher()
+        hasher.update(_json_bytes(sequences))
+        hasher.update(_json_bytes(metadata))
+        key = (hasher.digest(),)
+        analysis_result = _cache_lookup(EDNA_SEQUENCE_CACHE, key)
+        if analysis_result is None:
+            # Use the EDNAAnalyzer class, off the event loop
+            analysis_result = await run_blocking(
+                services.EDNAAnalyzer.analyze_edna_sequences, sequences, metadata or {}
+            )
+            _cache_store(EDNA_SEQUENCE_CACHE, key, analysis_result)
         
-        return JSONResponse(content={
+        return DefaultResponse(content={
             "status": "success",
             "analysis": analysis_result
         })
@@ -450,14 +979,14 @@ async def create_manuscript(
     """Create and analyze research manuscript."""
     try:
         authors_list = [author.strip() for author in authors.split(',')]
-        metadata_dict = json.loads(metadata) if metadata else {}
+        metadata_dict = loads_json(metadata) if metadata else {}
         
         # Use the ResearchPublisher class
         manuscript = services.ResearchPublisher.create_manuscript(
             title, authors_list, abstract, content, metadata_dict
         )
         
-        return JSONResponse(content={
+        return DefaultResponse(content={
             "status": "success",
             "manuscript": manuscript
         })
@@ -472,14 +1001,14 @@ async def initiate_peer_review(
 ):
     """Initiate peer review process."""
     try:
-        criteria = json.loads(reviewer_criteria) if reviewer_criteria else {}
+        criteria = loads_json(reviewer_criteria) if reviewer_criteria else {}
         
         # Use the ResearchPublisher class
         review_process = services.ResearchPublisher.initiate_peer_review(
             manuscript_id, criteria
         )
         
-        return JSONResponse(content={
+        return DefaultResponse(content={
             "status": "success",
             "review_process": review_process
         })
@@ -494,12 +1023,12 @@ async def process_marine_sensor_data(
 ):
     """Process real-time marine sensor data."""
     try:
-        # Use the MarineDataProcessor class
-        processing_result = services.MarineDataProcessor.process_realtime_data(
-            sensor_data, data_type
+        # Use the MarineDataProcessor class, off the event loop
+        processing_result = await run_blocking(
+            services.MarineDataProcessor.process_realtime_data, sensor_data, data_type
         )
         
-        return JSONResponse(content={
+        return DefaultResponse(content={
             "status": "success",
             "processing_result": processing_result
         })
@@ -507,72 +1036,84 @@ async def process_marine_sensor_data(
         raise HTTPException(status_code=500, detail=f"Marine data processing failed: {str(e)}")
 
 
+# Mock taxonomy datasets
+TAXONOMY_DATASETS = [
+    {
+        "id": "taxonomy_worms_2024",
+        "dataset_name": "WoRMS Marine Taxa 2024",
+        "data_format": "darwin_core",
+        "source": "World Register of Marine Species",
+        "description": "Comprehensive marine species taxonomy database",
+        "upload_date": "2024-01-15T10:30:00Z",
+        "status": "active",
+        "record_count": 245892,
+        "species_count": 180543,
+        "kingdoms": ["Animalia", "Plantae", "Chromista"],
+        "file_size": 125000000
+    },
+    {
+        "id": "taxonomy_fishbase_2024",
+        "dataset_name": "FishBase Taxonomy",
+        "data_format": "csv",
+        "source": "FishBase",
+        "description": "Global fish species database with taxonomic hierarchy",
+        "upload_date": "2024-01-12T14:20:00Z",
+        "status": "active",
+        "record_count": 34567,
+        "species_count": 34567,
+        "kingdoms": ["Animalia"],
+        "file_size": 45000000
+    }
+]
+TAXONOMY_DATASETS_JSON, TAXONOMY_DATASETS_ETAG = _prerendered_json(TAXONOMY_DATASETS)
+
+
 @app.get("/api/taxonomy/datasets")
-async def list_taxonomy_datasets():
+async def list_taxonomy_datasets(request: Request):
     """List uploaded taxonomy datasets."""
-    # Mock taxonomy datasets
-    return [
-        {
-            "id": "taxonomy_worms_2024",
-            "dataset_name": "WoRMS Marine Taxa 2024",
-            "data_format": "darwin_core",
-            "source": "World Register of Marine Species",
-            "description": "Comprehensive marine species taxonomy database",
-            "upload_date": "2024-01-15T10:30:00Z",
-            "status": "active",
-            "record_count": 245892,
-            "species_count": 180543,
-            "kingdoms": ["Animalia", "Plantae", "Chromista"],
-            "file_size": 125000000
-        },
-        {
-            "id": "taxonomy_fishbase_2024",
-            "dataset_name": "FishBase Taxonomy",
-            "data_format": "csv",
-            "source": "FishBase",
-            "description": "Global fish species database with taxonomic hierarchy",
-            "upload_date": "2024-01-12T14:20:00Z",
-            "status": "active",
-            "record_count": 34567,
-            "species_count": 34567,
-            "kingdoms": ["Animalia"],
-            "file_size": 45000000
-        }
-    ]
+    if wants_ndjson(request):
+        return ndjson_response(TAXONOMY_DATASETS)
+    return _prerendered_response(request, TAXONOMY_DATASETS_JSON, TAXONOMY_DATASETS_ETAG)
+
+
+# Mock eDNA samples (this would normally come from a database)
+EDNA_SAMPLES = [{
+    "id": "sample_001",
+    "sample_id": "sample_001",
+    "location_name": "Great Barrier Reef",
+    "latitude": -16.2839,
+    "longitude": 145.7781,
+    "collection_date": "2024-01-15",
+    "depth_meters": 10,
+    "status": "uploaded",
+    "sequence_count": 1247,
+    "avg_length": 150.5,
+    "file_format": "fastq",
+    "quality_score": 95.2
+}]
+EDNA_SAMPLES_JSON, EDNA_SAMPLES_ETAG = _prerendered_json(EDNA_SAMPLES)
 
 
 @app.get("/api/edna-samples")
-async def list_edna_samples():
+async def list_edna_samples(request: Request):
     """List uploaded eDNA samples."""
-    # This would normally query a database
-    # For now, return mock data
-    return [{
-        "id": "sample_001",
-        "sample_id": "sample_001",
-        "location_name": "Great Barrier Reef",
-        "latitude": -16.2839,
-        "longitude": 145.7781,
-        "collection_date": "2024-01-15",
-        "depth_meters": 10,
-        "status": "uploaded",
-        "sequence_count": 1247,
-        "avg_length": 150.5,
-        "file_format": "fastq",
-        "quality_score": 95.2
-    }]
+    if wants_ndjson(request):
+        return ndjson_response(EDNA_SAMPLES)
+    return _prerendered_response(request, EDNA_SAMPLES_JSON, EDNA_SAMPLES_ETAG)
 
 
 @app.websocket("/ws/updates")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    if not await manager.connect(websocket):
+        return
     try:
         # send a welcome message
-        await websocket.send_json({"type": "welcome", "message": "connected to Matsya backend"})
+        await websocket.send_text(WS_WELCOME_FRAME)
         while True:
             # keep connection alive; receive pings from client
             data = await websocket.receive_text()
-            # echo for now
-            await websocket.send_json({"type": "echo", "message": data})
+            # echo for now, splicing the encoded text into a fixed envelope
+            await websocket.send_text(WS_ECHO_PREFIX + dumps_json(data) + "}")
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception:
@@ -580,6 +1121,14 @@ async def websocket_endpoint(websocket: WebSocket):
 
 
 # Marine Research Chatbot Endpoints
+async def _recent_activity() -> tuple[list[str], list[dict]]:
+    """Fetch recent species and classifications for chat context concurrently."""
+    return tuple(await asyncio.gather(
+        services.get_recent_species_names(),
+        services.get_recent_classifications()
+    ))
+
+
 @app.post("/api/chat")
 async def chat_with_matsya_ai(
     message: str = Form(...),
@@ -591,18 +1140,19 @@ async def chat_with_matsya_ai(
         # Gather platform context if requested
         context = None
         if include_context:
+            recent_species, recent_classifications = await _recent_activity()
             context = {
-                "recent_species": await services.get_recent_species_names(),
+                "recent_species": recent_species,
                 "location": {"name": "Research Area", "lat": 0, "lng": 0},  # Could be dynamic
                 "edna_results": {"species_count": 15},  # From recent analysis
-                "recent_classifications": await services.get_recent_classifications()
+                "recent_classifications": recent_classifications
             }
         
         response = await marine_chatbot.chat(message, user_id, context)
-        return JSONResponse(content=response)
+        return DefaultResponse(content=response)
         
     except Exception as e:
-        return JSONResponse(
+        return DefaultResponse(
             status_code=500, 
             content={"success": False, "error": f"Chat service failed: {str(e)}"}
         )
@@ -613,14 +1163,11 @@ async def websocket_chat(websocket: WebSocket, user_id: str):
     """WebSocket endpoint for real-time streaming chat."""
     await websocket.accept()
     try:
-        await websocket.send_json({
-            "type": "connected",
-            "message": "Connected to Matsya AI, your marine research assistant!"
-        })
+        await websocket.send_text(WS_CHAT_CONNECTED_FRAME)
         
         while True:
             # Receive message from client
-            data = await websocket.receive_json()
+            data = loads_json(await websocket.receive_text())
             
             if data.get("type") == "chat":
                 message = data.get("message", "")
@@ -629,25 +1176,23 @@ async def websocket_chat(websocket: WebSocket, user_id: str):
                 # Gather context
                 context = None
                 if include_context:
+                    recent_species, recent_classifications = await _recent_activity()
                     context = {
-                        "recent_species": await services.get_recent_species_names(),
-                        "recent_classifications": await services.get_recent_classifications()
+                        "recent_species": recent_species,
+                        "recent_classifications": recent_classifications
                     }
                 
                 # Stream response
                 async for chunk in marine_chatbot.stream_chat(message, user_id, context):
-                    await websocket.send_json(chunk)
+                    await send_json(websocket, chunk)
             
             elif data.get("type") == "clear":
-                marine_chatbot.clear_conversation(user_id)
-                await websocket.send_json({
-                    "type": "cleared",
-                    "message": "Conversation history cleared"
-                })
+                await marine_chatbot.clear_conversation(user_id)
+                await websocket.send_text(WS_CHAT_CLEARED_FRAME)
             
             elif data.get("type") == "summary":
-                summary = marine_chatbot.get_conversation_summary(user_id)
-                await websocket.send_json({
+                summary = await marine_chatbot.get_conversation_summary(user_id)
+                await send_json(websocket, {
                     "type": "summary",
                     "data": summary
                 })
@@ -655,7 +1200,7 @@ async def websocket_chat(websocket: WebSocket, user_id: str):
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        await websocket.send_json({
+        await send_json(websocket, {
             "type": "error",
             "error": str(e)
         })
@@ -664,12 +1209,12 @@ async def websocket_chat(websocket: WebSocket, user_id: str):
 @app.get("/api/chat/conversation/{user_id}")
 async def get_conversation_summary(user_id: str):
     """Get conversation summary and statistics."""
-    summary = marine_chatbot.get_conversation_summary(user_id)
-    return JSONResponse(content=summary)
+    summary = await marine_chatbot.get_conversation_summary(user_id)
+    return DefaultResponse(content=summary)
 
 
 @app.delete("/api/chat/conversation/{user_id}")
 async def clear_conversation(user_id: str):
     """Clear conversation history for a user."""
-    marine_chatbot.clear_conversation(user_id)
-    return JSONResponse(content={"message": "Conversation cleared successfully"})
+    await marine_chatbot.clear_conversation(user_id)
+    return DefaultResponse(content={"message": "Conversation cleared successfully"})
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, List, Tuple
 
 
 class SpeciesOccurrence(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     id: str
     scientificName: str
     commonName: Optional[str] = None
@@ -16,6 +18,8 @@ class SpeciesOccurrence(BaseModel):
 
 
 class MLClassificationResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     predictions: Dict[str, float]
     topPrediction: Tuple[str, float]
     confidence: float
@@ -23,6 +27,8 @@ class MLClassificationResult(BaseModel):
 
 
 class AnalysisConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     type: str
     region: Optional[str] = None
     dateRange: Optional[List[str]] = None
@@ -31,12 +37,16 @@ class AnalysisConfig(BaseModel):
 
 
 class AnalysisResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     summary: str
     metrics: Dict[str, float]
     chartData: List[Dict]
 
 
 class TaxonomyDataset(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     id: str
     dataset_name: str
     data_format: str
@@ -50,7 +60,21 @@ class TaxonomyDataset(BaseModel):
     file_size: int
 
 
+class EDNASampleUploadRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    sample_id: str
+    location_name: str
+    latitude: float
+    longitude: float
+    collection_date: str
+    depth_meters: Optional[float] = None
+    notes: Optional[str] = None
+
+
 class TaxonomyUploadRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     dataset_name: str
     data_format: str = Field(..., description="Format: darwin_core, csv, tsv, json, excel")
     source: str
@@ -0,0 +1,154 @@
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+EDNA_FORM = {
+    "sample_id": "s1", "location_name": "Kochi", "latitude": "9.9",
+    "longitude": "76.2", "collection_date": "2024-01-15"
+}
+
+
+@asynccontextmanager
+async def no_lifespan(app):
+    yield
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Run pool jobs inline with fresh caches, recording each parse function called"""
+    calls = []
+
+    async def run_inline(func, *args):
+        calls.append(func.__name__)
+        return func(*args)
+    monkeypatch.setattr(main, "run_cpu_bound", run_inline)
+    monkeypatch.setattr(main, "run_blocking", run_inline)
+    for cache in ("EDNA_CACHE", "EDNA_SEQUENCE_CACHE", "TAXONOMY_CACHE"):
+        monkeypatch.setattr(main, cache, OrderedDict())
+    return calls
+
+
+@pytest.fixture
+def client(monkeypatch, parses):
+    monkeypatch.setattr(main.app.router, "lifespan_context", no_lifespan)
+    with TestClient(main.app) as client:
+        yield client
+
+
+def upload_edna(client, filename, content):
+    response = client.post("/api/edna-samples", data=EDNA_FORM, files={"file": (filename, content, "text/plain")})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_cache_entries_expire(monkeypatch):
+    cache = OrderedDict()
+    main._cache_store(cache, ("key",), {"value": 1})
+    assert main._cache_lookup(cache, ("key",)) == {"value": 1}
+    monkeypatch.setattr(main, "ANALYSIS_CACHE_TTL", -1)
+    main._cache_store(cache, ("key",), {"value": 2})
+    assert main._cache_lookup(cache, ("key",)) is None
+
+
+def test_cache_drops_least_recently_used(monkeypatch):
+    monkeypatch.setattr(main, "ANALYSIS_CACHE_SIZE", 2)
+    cache = OrderedDict()
+    main._cache_store(cache, ("a",), {"value": "a"})
+    main._cache_store(cache, ("b",), {"value": "b"})
+    main._cache_lookup(cache, ("a",))
+    main._cache_store(cache, ("c",), {"value": "c"})
+    assert list(cache) == [("a",), ("c",)]
+
+
+def test_identical_edna_upload_is_parsed_once(client, parses):
+    content = b">a\nACGT\n>b\nACGTAC\n"
+    first = upload_edna(client, "reads.fasta", content)
+    second = upload_edna(client, "reads.fasta", content)
+    assert first["sequence_count"] == second["sequence_count"] == 2
+    assert parses == ["process_edna_path"]
+
+
+def test_edna_cache_is_keyed_on_content_and_extension(client, parses):
+    upload_edna(client, "reads.fasta", b">a\nACGT\n")
+    upload_edna(client, "reads.fasta", b">a\nACGTAC\n")
+    upload_edna(client, "reads.txt", b">a\nACGT\n")
+    assert parses == ["process_edna_path"] * 3
+
+
+def test_saved_upload_is_removed_after_a_cache_hit(client, monkeypatch):
+    saved = []
+    save_upload = main._save_upload
+
+    async def record_path(file, max_size):
+        result = await save_upload(file, max_size)
+        saved.append(result[0])
+        return result
+    monkeypatch.setattr(main, "_save_upload", record_path)
+    upload_edna(client, "reads.fasta", b">a\nACGT\n")
+    upload_edna(client, "reads.fasta", b">a\nACGT\n")
+    assert len(saved) == 2
+    assert not any(os.path.exists(path) for path in saved)
+
+
+DARWIN_CORE = (
+    b"scientificName,kingdom,phylum,class,order,family,genus\n"
+    b"Thunnus albacares,Animalia,Chordata,Actinopterygii,Scombriformes,Scombridae,Thunnus\n"
+)
+
+
+def upload_taxonomy(client, data_format, content=DARWIN_CORE, filename="data.csv"):
+    response = client.post(
+        "/api/taxonomy/upload",
+        data={"dataset_name": "d", "data_format": data_format, "source": "test"},
+        files={"file": (filename, content, "text/csv")}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_identical_taxonomy_upload_is_parsed_once(client, parses):
+    first = upload_taxonomy(client, "darwin_core")
+    second = upload_taxonomy(client, "darwin_core")
+    assert first["record_count"] == second["record_count"] == 1
+    assert second["file_size"] == len(DARWIN_CORE)
+    assert parses == ["process_taxonomy_file"]
+
+
+def test_taxonomy_cache_is_keyed_on_format_and_extension(client, parses):
+    upload_taxonomy(client, "darwin_core")
+    upload_taxonomy(client, "csv")
+    upload_taxonomy(client, "csv", filename="data.txt")
+    assert parses == ["process_taxonomy_file"] * 3
+
+
+def test_identical_validation_is_parsed_once(client, parses):
+    for _ in range(2):
+        response = client.post("/api/taxonomy/validate", files={"file": ("data.csv", DARWIN_CORE, "text/csv")})
+        assert response.status_code == 200
+        assert response.json()["validation_result"]["record_count"] == 1
+    assert parses == ["analyze_darwin_core"]
+
+
+def analyze_sequences(client, sequences, metadata=None):
+    response = client.post("/api/edna/analyze", json={"sequences": sequences, "metadata": metadata})
+    assert response.status_code == 200
+    return response.json()["analysis"]
+
+
+def test_identical_sequence_analysis_is_computed_once(client, parses):
+    first = analyze_sequences(client, ["ACGTACGT", "GGCCAATT"], {"site": "Kochi"})
+    second = analyze_sequences(client, ["ACGTACGT", "GGCCAATT"], {"site": "Kochi"})
+    assert first == second
+    assert parses == ["analyze_edna_sequences"]
+
+
+def test_sequence_analysis_cache_is_keyed_on_sequences_and_metadata(client, parses):
+    analyze_sequences(client, ["ACGTACGT"], {"site": "Kochi"})
+    analyze_sequences(client, ["ACGTACGA"], {"site": "Kochi"})
+    analyze_sequences(client, ["ACGTACGT"], {"site": "Goa"})
+    assert parses == ["analyze_edna_sequences"] * 3
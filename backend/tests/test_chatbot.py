@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+from app import chatbot
+from app.chatbot import MarineResearchChatbot
+
+
+class FakeOpenAI:
+    """Records calls and answers like the OpenAI client, optionally failing embeddings"""
+
+    def __init__(self, embedding_error=None):
+        self.embedding_calls = 0
+        self.completion_calls = 0
+        self.embedding_error = embedding_error
+        self.embeddings = SimpleNamespace(create=self._embed)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+
+    async def _embed(self, model, input):
+        self.embedding_calls += 1
+        if self.embedding_error is not None:
+            raise self.embedding_error
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, float(len(input)), 0.5])])
+
+    async def _complete(self, **kwargs):
+        self.completion_calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"answer {self.completion_calls}"))],
+            usage=SimpleNamespace(total_tokens=42)
+        )
+
+
+def openai_bot(client):
+    bot = MarineResearchChatbot()
+    bot.openai_client = client
+    bot.ai_service = "openai"
+    return bot
+
+
+def test_embedding_failure_falls_through_to_model():
+    client = FakeOpenAI(embedding_error=RuntimeError("embeddings unavailable"))
+    bot = openai_bot(client)
+    result = asyncio.run(bot.chat("Where do yellowfin tuna spawn?", user_id="u1"))
+    assert result["success"]
+    assert result["ai_service"] == "openai"
+    assert result["response"] == "answer 1"
+    assert client.completion_calls == 1
+    assert len(bot.response_cache) == 0
+
+
+def test_semantic_cache_answers_a_similar_question_in_the_same_context():
+    client = FakeOpenAI()
+    bot = openai_bot(client)
+    first = asyncio.run(bot.chat("Where do yellowfin tuna spawn?", user_id="u1"))
+    second = asyncio.run(bot.chat("Where do yellowfin tunas spawn?", user_id="u2"))
+    assert first["ai_service"] == "openai"
+    assert second["ai_service"] == "cache"
+    assert second["response"] == first["response"]
+    assert client.completion_calls == 1
+
+
+def test_repeated_prompt_is_answered_without_embedding(monkeypatch):
+    client = FakeOpenAI()
+    bot = openai_bot(client)
+    embedded = []
+    embed = bot._embed
+
+    async def spy(text):
+        embedded.append(text)
+        return await embed(text)
+    monkeypatch.setattr(bot, "_embed", spy)
+
+    first = asyncio.run(bot.chat("What is eDNA metabarcoding?", user_id="u1"))
+    second = asyncio.run(bot.chat("What is eDNA metabarcoding?", user_id="u2"))
+    assert second["ai_service"] == "exact-cache"
+    assert second["response"] == first["response"]
+    assert embedded == ["What is eDNA metabarcoding?"]
+    assert client.embedding_calls == 1
+    assert client.completion_calls == 1
+
+
+def test_exact_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(chatbot, "EXACT_CACHE_SIZE", 2)
+    client = FakeOpenAI()
+    bot = openai_bot(client)
+    for i in range(4):
+        asyncio.run(bot.chat(f"Question {i}", user_id=f"u{i}"))
+    assert len(bot._exact_cache) == 2
@@ -0,0 +1,83 @@
+import io
+
+from app import services
+
+HEADER = "scientificName,kingdom,phylum,class,order,family,genus,decimalLatitude,decimalLongitude,country\n"
+
+
+def test_complete_record_is_valid():
+    record = {
+        'scientificName': 'Thunnus albacares', 'kingdom': 'Animalia', 'phylum': 'Chordata',
+        'class': 'Actinopterygii', 'order': 'Scombriformes', 'family': 'Scombridae', 'genus': 'Thunnus',
+        'decimalLatitude': '10.5', 'decimalLongitude': '72.1'
+    }
+    result = services.DarwinCoreValidator.validate_record(record)
+    assert result['valid']
+    assert result['errors'] == []
+    assert result['warnings'] == []
+    assert result['completeness_score'] == 100.0
+
+
+def test_record_issues_are_reported():
+    record = {'scientificName': 'bad name', 'kingdom': 'Animalia', 'decimalLatitude': '95', 'decimalLongitude': 'east'}
+    result = services.DarwinCoreValidator.validate_record(record)
+    assert not result['valid']
+    assert "Coordinates must be numeric" in result['errors']
+    assert sum(error.startswith("Missing required field") for error in result['errors']) == 5
+    assert result['warnings'] == [
+        "Scientific name may not follow binomial nomenclature",
+        "Incomplete taxonomic hierarchy",
+    ]
+
+
+def test_out_of_range_coordinates():
+    row = ['Gadus morhua', '95', '-200']
+    result = services.DarwinCoreValidator.validate_row(row, {'scientificName': 0, 'decimalLatitude': 1, 'decimalLongitude': 2})
+    assert "Invalid latitude: must be between -90 and 90" in result['errors']
+    assert "Invalid longitude: must be between -180 and 180" in result['errors']
+
+
+def test_reported_issues_are_capped():
+    records = [{'scientificName': 'x'}] * (services.DarwinCoreValidator.MAX_REPORTED_ISSUES + 10)
+    result = services.DarwinCoreValidator.validate_dataset(records)
+    assert result['total_records'] == len(records)
+    assert result['valid_records'] == 0
+    assert len(result['errors']) == services.DarwinCoreValidator.MAX_REPORTED_ISSUES
+    assert len(result['warnings']) == services.DarwinCoreValidator.MAX_REPORTED_ISSUES
+    assert result['errors'][0].startswith("Record 1: Missing required field")
+
+
+def test_analyze_darwin_core_file():
+    content = HEADER + (
+        "Thunnus albacares,Animalia,Chordata,Actinopterygii,Scombriformes,Scombridae,Thunnus,10.5,72.1,India\n"
+        "Gadus morhua,Animalia,Chordata,Actinopterygii,Gadiformes,Gadidae,Gadus,95,10,Norway\n"
+        "\n"
+        "Lutjanus gibbus,Animalia,Chordata\n"
+    )
+    result = services.analyze_darwin_core(content)
+    assert result['record_count'] == 3
+    assert result['species_count'] == 2
+    validation = result['validation']
+    # The short last row reads as empty cells
+    assert validation['valid_records'] == 1
+    assert validation['errors'] == [
+        "Record 2: Invalid latitude: must be between -90 and 90",
+        "Record 3: Coordinates must be numeric",
+    ]
+    assert validation['warnings'] == ["Record 3: Incomplete taxonomic hierarchy"]
+    assert result['diversity_metrics']['total_genera'] == 2
+    assert result['field_mapping']['required_fields_present'] == 7
+    assert result['geographic_distribution']['coordinates'] == [{'lat': 10.5, 'lon': 72.1, 'species': 'Thunnus albacares'}]
+    assert result['geographic_distribution']['countries'] == {'India': 1, 'Norway': 1}
+
+
+def test_text_and_stream_agree():
+    content = HEADER + "Thunnus albacares,Animalia,Chordata,Actinopterygii,Scombriformes,Scombridae,Thunnus,1,2,India\n"
+    from_text = services.analyze_darwin_core(content)
+    from_upload = services.process_taxonomy_file(io.BytesIO(content.encode()), "data.csv", "darwin_core")
+    assert from_text == from_upload
+
+
+def test_empty_file_has_no_records():
+    result = services.analyze_darwin_core(HEADER)
+    assert result['error'] == 'No records found in file'
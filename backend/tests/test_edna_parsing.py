@@ -0,0 +1,105 @@
+import io
+
+import pytest
+
+from app import services
+
+
+def test_fastq_quality_longer_than_sequence_is_invalid():
+    content = b"@r1\ncACCg\n+\nI!!5!I\n@r2\nACGT\n+\nIIII\n"
+    result = services.process_edna_file(content, "reads.fastq")
+    assert result['total_sequences'] == 2
+    assert result['sequence_count'] == 1
+    assert result['avg_length'] == 4
+    assert result['avg_quality'] == 40.0
+    assert result['quality_score'] == 50.0
+
+
+def test_fastq_quality_shorter_than_sequence_is_invalid():
+    content = b"@r1\nACGT\n+\nII\n@r2\nAC\n+\n!!\n"
+    result = services.process_edna_file(content, "reads.fq")
+    assert result['total_sequences'] == 2
+    assert result['sequence_count'] == 1
+    assert result['avg_quality'] == 0.0
+
+
+def test_fastq_rejects_non_dna_bases():
+    result = services.process_edna_file(b"@r1\nACXT\n+\nIIII\n", "reads.fastq")
+    assert result['sequence_count'] == 0
+    assert result['total_sequences'] == 1
+
+
+@pytest.mark.parametrize("filename", ["reads.fastq", "reads.txt"])
+def test_fastq_bytes_and_stream_agree(filename):
+    content = b"@r1\nACGTN\n+\nIIII5\n@r2\nacgt\n+\n!!!!\n@r3\nAC\n+\nIII\n"
+    from_bytes = services.process_edna_file(content, filename)
+    from_stream = services.process_edna_file(io.BytesIO(content), filename)
+    assert from_bytes == from_stream
+    assert from_bytes['file_format'] == 'fastq'
+    assert from_bytes['sequence_count'] == 2
+
+
+def test_fastq_quality_batches_match_single_pass():
+    records = [(b"ACGT" * 10, bytes([33 + i % 41]) * 40) for i in range(services.FASTQ_QUALITY_BATCH_READS + 7)]
+    result = services.analyze_fastq_records(records)
+    expected = sum(i % 41 for i in range(len(records))) / len(records)
+    assert result['avg_quality'] == round(expected, 2)
+
+
+def test_fasta_multiline_records():
+    content = b">s1\nACGT\nAC GT\n>s2\nACXX\n>s3\n>s4 desc\nNNNN\n"
+    result = services.process_edna_file(content, "seqs.fasta")
+    assert result['total_sequences'] == 4
+    assert result['sequence_count'] == 2
+    assert result['total_length'] == 12
+    assert result['avg_length'] == 6.0
+
+
+def test_unknown_format_is_reported():
+    result = services.process_edna_file(b"hello\nworld\n", "notes.txt")
+    assert result['file_format'] == 'unknown'
+    assert result['sequence_count'] == 0
+
+
+@pytest.mark.parametrize("filename, content", [
+    ("seqs.fasta", b">s1\nACGT\nGG\n>s2\nNNAC\n>s3\nACXX\n"),
+    ("reads.fastq", b"@r1\nACGTN\n+\nIIII5\n@r2\nACG\n+\nII\n"),
+])
+def test_saved_file_matches_upload_bytes(tmp_path, filename, content):
+    path = tmp_path / filename
+    path.write_bytes(content)
+    assert services.process_edna_path(str(path), filename) == services.process_edna_file(content, filename)
+
+
+@pytest.mark.parametrize("filename, content", [
+    ("seqs.fasta", b">s1 caf\xe9\nACGT\n"),
+    ("reads.fastq", b"@r1 \xff\nACGT\n+\nIIII\n"),
+])
+def test_non_utf8_headers_are_parsed(filename, content):
+    result = services.process_edna_file(content, filename)
+    assert result['sequence_count'] == 1
+    assert result['avg_length'] == 4.0
+
+
+def test_fasta_text_before_first_header_and_bare_headers():
+    # As with '>'-delimited records, the first non-empty line of a record is its header
+    content = b"notes\nACGT\n>\nAC\n>s2\r\nAC\r\nGT\r\n\r\n"
+    result = services.process_edna_file(content, "seqs.fasta")
+    assert result['total_sequences'] == 3
+    assert result['sequence_count'] == 2
+    assert result['total_length'] == 8
+
+
+def test_fasta_large_record_streams():
+    content = b">big\n" + b"ACGTACGTAC\n" * 50_000 + b">small\nAC\n"
+    result = services.process_edna_file(io.BytesIO(content), "seqs.fa")
+    assert result['sequence_count'] == 2
+    assert result['total_length'] == 500_002
+
+
+def test_fastq_mixed_read_lengths_share_a_batch():
+    # '!' scores 0, '5' scores 20 and 'I' scores 40; the empty read scores 0
+    records = [(b"", b""), (b"ACG", b"!!I"), (b"A", b"5")]
+    result = services.analyze_fastq_records(records)
+    assert result['sequence_count'] == 3
+    assert result['avg_quality'] == round((0 + 40 / 3 + 20) / 3, 2)
@@ -0,0 +1,26 @@
+import pytest
+from pydantic import ValidationError
+
+from app import schemas, services
+
+
+def test_obis_occurrence_keeps_the_species_response_shape():
+    record = {"scientificName": "Thunnus albacares", "family": "Scombridae",
+              "decimalLatitude": "10.5", "decimalLongitude": "72.1", "depth": "30"}
+    occurrence = services._obis_occurrence("obis-1", record, "Thunnus albacares")
+    assert set(occurrence.model_dump()) == set(schemas.SpeciesOccurrence.model_fields)
+    assert "family" not in occurrence.model_dump()
+    assert occurrence.depth == 30.0
+
+
+def test_schemas_reject_unknown_fields():
+    with pytest.raises(ValidationError):
+        schemas.SpeciesOccurrence(id="1", scientificName="Gadus morhua", latitude=1.0, longitude=2.0,
+                                  dataSource="OBIS", family="Gadidae")
+
+
+def test_schemas_are_frozen():
+    occurrence = schemas.SpeciesOccurrence(id="1", scientificName="Gadus morhua", latitude=1.0,
+                                           longitude=2.0, dataSource="OBIS")
+    with pytest.raises(ValidationError):
+        occurrence.scientificName = "Thunnus albacares"
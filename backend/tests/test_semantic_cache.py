@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+from app import chatbot
+from app.chatbot import SemanticCache
+
+
+def unit(*values):
+    vector = np.zeros(8, dtype=np.float32)
+    vector[:len(values)] = values
+    return vector
+
+
+@pytest.mark.parametrize("faiss_available", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not chatbot.FAISS_AVAILABLE, reason="faiss not installed")),
+])
+def test_large_partition_lookup(monkeypatch, faiss_available):
+    monkeypatch.setattr(chatbot, "FAISS_AVAILABLE", faiss_available)
+    monkeypatch.setattr(chatbot, "SEMANTIC_CACHE_HNSW_MIN_ENTRIES", 4)
+    cache = SemanticCache()
+    basis = np.eye(8, dtype=np.float32)
+    for i in range(6):
+        cache.add("ctx", basis[i], f"answer {i}")
+    assert [cache.lookup("ctx", basis[i]) for i in range(6)] == [f"answer {i}" for i in range(6)]
+    assert cache.lookup("ctx", basis[7]) is None
+
+
+def test_small_partitions_skip_hnsw(monkeypatch):
+    def no_index(dim):
+        raise AssertionError("small partitions should be scored with numpy")
+    monkeypatch.setattr(SemanticCache, "_new_index", staticmethod(no_index))
+    cache = SemanticCache()
+    cache.add("ctx", unit(1), "answer")
+    cache.add("ctx", unit(0, 1), "other answer")
+    assert cache.lookup("ctx", unit(0, 1)) == "other answer"
+
+
+def test_projection_is_applied_to_queries_and_entries():
+    mean = np.zeros(8, dtype=np.float32)
+    components = np.eye(8, dtype=np.float32)[:2]
+    cache = SemanticCache(projection=(mean, components))
+    cache.add("ctx", unit(1, 0, 5), "answer")
+    assert cache.lookup("ctx", unit(1, 0, -5)) == "answer"
+
+
+def test_projection_round_trip(tmp_path):
+    pytest.importorskip("sklearn")
+    embeddings = np.random.default_rng(0).normal(size=(64, 16)).astype(np.float32)
+    path = str(tmp_path / "pca.npz")
+    chatbot.fit_embedding_projection(embeddings, path, n_components=4)
+    mean, components = chatbot.load_embedding_projection(path)
+    assert mean.shape == (16,)
+    assert components.shape == (4, 16)
+
+
+def test_missing_projection_is_ignored(tmp_path):
+    assert chatbot.load_embedding_projection(None) is None
+    assert chatbot.load_embedding_projection(str(tmp_path / "missing.npz")) is None
+
+
+def test_context_hash_uses_recent_turns_only():
+    turns = ["what is eDNA?", "how is it sampled?", "which primers?"]
+    assert SemanticCache.context_hash("system", turns) == SemanticCache.context_hash("system", ["other"] + turns[1:])
+    assert SemanticCache.context_hash("system", turns) != SemanticCache.context_hash("system", turns[:2])
+    assert SemanticCache.context_hash("system", turns) != SemanticCache.context_hash("other system", turns)
+
+
+def test_hit_and_miss():
+    cache = SemanticCache(threshold=0.9)
+    cache.add("ctx", unit(1, 0), "tuna answer")
+    cache.add("ctx", unit(0, 1), "cod answer")
+    assert cache.lookup("ctx", unit(1, 0.1)) == "tuna answer"
+    assert cache.lookup("ctx", unit(0.1, 1)) == "cod answer"
+    assert cache.lookup("ctx", unit(1, 1)) is None
+
+
+def test_entries_are_partitioned_by_context():
+    cache = SemanticCache()
+    cache.add("ctx-a", unit(1), "answer a")
+    assert cache.lookup("ctx-b", unit(1)) is None
+    assert cache.lookup("ctx-a", unit(1)) == "answer a"
+
+
+def test_least_recently_used_context_is_evicted():
+    cache = SemanticCache(max_entries=2)
+    cache.add("a", unit(1), "answer a")
+    cache.add("b", unit(1), "answer b")
+    assert cache.lookup("a", unit(1)) == "answer a"
+    cache.add("c", unit(1), "answer c")
+    assert len(cache) == 2
+    assert cache.lookup("b", unit(1)) is None
+    assert cache.lookup("a", unit(1)) == "answer a"
+    assert cache.lookup("c", unit(1)) == "answer c"
+
+
+@pytest.mark.parametrize("max_entries, max_partition_entries", [(5, 100), (100, 5)])
+def test_single_hot_context_is_bounded(max_entries, max_partition_entries):
+    cache = SemanticCache(max_entries=max_entries, max_partition_entries=max_partition_entries)
+    basis = np.eye(64, dtype=np.float32)
+    for i in range(50):
+        cache.add("first-turn", basis[i], f"answer {i}")
+    assert len(cache) == 5
+    assert cache.lookup("first-turn", basis[44]) is None
+    assert [cache.lookup("first-turn", basis[i]) for i in range(45, 50)] == [f"answer {i}" for i in range(45, 50)]
+
+
+def test_expired_context_is_dropped():
+    cache = SemanticCache(ttl=-1)
+    cache.add("ctx", unit(1), "answer")
+    assert cache.lookup("ctx", unit(1)) is None
+    assert len(cache) == 0
+
+
+def test_responses_expire_individually(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(chatbot.time, "monotonic", lambda: now[0])
+    cache = SemanticCache(ttl=10)
+    cache.add("ctx", unit(1), "old answer")
+    now[0] += 6
+    cache.add("ctx", unit(0, 1), "new answer")
+    now[0] += 6
+    assert cache.lookup("ctx", unit(1)) is None
+    assert cache.lookup("ctx", unit(0, 1)) == "new answer"
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize("faiss_available", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not chatbot.FAISS_AVAILABLE, reason="faiss not installed")),
+])
+def test_evicted_responses_are_not_returned(monkeypatch, faiss_available):
+    monkeypatch.setattr(chatbot, "FAISS_AVAILABLE", faiss_available)
+    monkeypatch.setattr(chatbot, "SEMANTIC_CACHE_HNSW_MIN_ENTRIES", 4)
+    cache = SemanticCache(max_partition_entries=6)
+    basis = np.eye(32, dtype=np.float32)
+    for i in range(30):
+        cache.add("ctx", basis[i], f"answer {i}")
+        assert cache.lookup("ctx", basis[i]) == f"answer {i}"
+    assert len(cache) == 6
+    assert [cache.lookup("ctx", basis[i]) for i in range(22, 30)] == [None, None] + [f"answer {i}" for i in range(24, 30)]
+
+
+@pytest.mark.parametrize("faiss_available", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not chatbot.FAISS_AVAILABLE, reason="faiss not installed")),
+])
+def test_evicted_response_does_not_hide_live_neighbours(monkeypatch, faiss_available):
+    monkeypatch.setattr(chatbot, "FAISS_AVAILABLE", faiss_available)
+    monkeypatch.setattr(chatbot, "SEMANTIC_CACHE_HNSW_MIN_ENTRIES", 2)
+    cache = SemanticCache(max_partition_entries=3)
+    cache.add("ctx", unit(1), "evicted answer")
+    for i in range(1, 4):
+        cache.add("ctx", unit(1, *[0.1 if j == i else 0 for j in range(1, 4)]), f"answer {i}")
+    assert cache.lookup("ctx", unit(1)) in {"answer 1", "answer 2", "answer 3"}
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+EDNA_FORM = {
+    "sample_id": "s1", "location_name": "Kochi", "latitude": "9.9",
+    "longitude": "76.2", "collection_date": "2024-01-15", "background": "true"
+}
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+@asynccontextmanager
+async def no_lifespan(app):
+    yield
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # One event loop for the whole test so background tasks outlive their
+    # request, without starting (and then shutting down) the worker pools
+    monkeypatch.setattr(main.app.router, "lifespan_context", no_lifespan)
+    monkeypatch.setattr(main, "run_cpu_bound", run_inline)
+    monkeypatch.setattr(main, "TASKS", main.OrderedDict())
+    with TestClient(main.app) as client:
+        yield client
+
+
+def wait_for_task(client, task_id):
+    for _ in range(100):
+        task = client.get(f"/api/tasks/{task_id}").json()
+        if task["status"] not in ("queued", "processing"):
+            return task
+        time.sleep(0.01)
+    raise AssertionError(f"task {task_id} did not finish")
+
+
+def test_background_upload_returns_ticket_then_result(client):
+    response = client.post(
+        "/api/edna-samples", data=EDNA_FORM,
+        files={"file": ("reads.fasta", b">a\nACGT\n>b\nACGTAC\n", "text/plain")}
+    )
+    assert response.status_code == 202
+    ticket = response.json()
+    assert ticket["status"] == "queued"
+    assert ticket["sample_id"] == "s1"
+
+    task = wait_for_task(client, ticket["task_id"])
+    assert task["status"] == "completed"
+    assert task["result"]["sample_id"] == "s1"
+    assert task["result"]["sequence_count"] == 2
+
+
+def test_unknown_task_is_404(client):
+    response = client.get("/api/tasks/missing")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Task not found"}
+
+
+def test_oldest_tickets_are_evicted(monkeypatch):
+    monkeypatch.setattr(main, "TASKS", main.OrderedDict())
+    monkeypatch.setattr(main, "MAX_TASKS", 2)
+    first, second, third = (main._create_task_ticket("edna_upload") for _ in range(3))
+    assert list(main.TASKS) == [second, third]
+
+
+def test_evicted_ticket_is_skipped(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "TASKS", main.OrderedDict())
+    path = tmp_path / "reads.fasta"
+    path.write_bytes(b">a\nACGT\n")
+    asyncio.run(main._process_edna_task("evicted", str(path), b"digest", "reads.fasta", {"sample_id": "s1"}))
+    assert not path.exists()
+    assert "evicted" not in main.TASKS
+
+
+def test_ticket_evicted_while_processing(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "TASKS", main.OrderedDict())
+    path = tmp_path / "reads.fasta"
+    path.write_bytes(b">a\nACGT\n")
+
+    async def evict_during_parse():
+        evicted = asyncio.Event()
+
+        async def parse_after_eviction(func, *args):
+            await evicted.wait()
+            return func(*args)
+        monkeypatch.setattr(main, "run_cpu_bound", parse_after_eviction)
+
+        task_id = main._create_task_ticket("edna_upload")
+        task = asyncio.create_task(
+            main._process_edna_task(task_id, str(path), b"evict", "reads.fasta", {"sample_id": "s1"})
+        )
+        await asyncio.sleep(0)
+        assert main.TASKS[task_id]["status"] == "processing"
+        main.TASKS.clear()
+        evicted.set()
+        await task
+        return task_id
+
+    task_id = asyncio.run(evict_during_parse())
+    assert task_id not in main.TASKS
+    assert not path.exists()
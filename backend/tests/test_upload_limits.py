@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+EDNA_FORM = {
+    "sample_id": "s1", "location_name": "Kochi", "latitude": "9.9",
+    "longitude": "76.2", "collection_date": "2024-01-15"
+}
+TAXONOMY_FORM = {"dataset_name": "d", "data_format": "csv", "source": "test"}
+
+ROUTES = [
+    ("/api/classify", "MAX_CLASSIFY_UPLOAD", ("fish.png", b"x" * 100, "image/png"), None,
+     "File size exceeds 10MB limit"),
+    ("/api/edna-samples", "MAX_EDNA_UPLOAD", ("reads.fasta", b">a\nACGT\n" * 20, "text/plain"), EDNA_FORM,
+     "File size exceeds 100MB limit"),
+    ("/api/taxonomy/upload", "MAX_TAXONOMY_UPLOAD", ("data.csv", b"a,b\n" * 50, "text/csv"), TAXONOMY_FORM,
+     "File size exceeds 500MB limit"),
+    ("/api/taxonomy/validate", "MAX_TAXONOMY_UPLOAD", ("data.csv", b"a,b\n" * 50, "text/csv"), None,
+     "File size exceeds 500MB limit"),
+]
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("path, limit, upload, form, message", ROUTES)
+def test_streamed_upload_over_limit(client, monkeypatch, path, limit, upload, form, message):
+    monkeypatch.setattr(main, limit, 10)
+    response = client.post(path, files={"file": upload}, data=form)
+    assert response.status_code == 413
+    assert response.json() == {"detail": message}
+
+
+@pytest.mark.parametrize("path, limit, upload, form, message", ROUTES)
+def test_declared_length_over_limit(client, monkeypatch, path, limit, upload, form, message):
+    monkeypatch.setitem(main.UPLOAD_LIMITS, path, (10, message))
+    monkeypatch.setattr(main, "UPLOAD_FORM_OVERHEAD", 0)
+    response = client.post(path, files={"file": upload}, data=form)
+    assert response.status_code == 413
+    assert response.json() == {"detail": message}